@@ -0,0 +1,5 @@
+import sys
+
+from logitech_g600.cli import main
+
+sys.exit(main())
@@ -0,0 +1,153 @@
+import numpy as np
+
+from logitech_g600 import codec
+from logitech_g600.report import iter_report_file
+
+# Bulk analysis of many profile report dumps with NumPy. Needs the optional numpy
+# dependency: pip install 'python-hidapi-logitech-g600[analysis]'
+#
+# The reports are loaded into one structured array whose dtype mirrors the report
+# layout (see codec.py), every statistic is computed column-wise over the array.
+
+REPORT_DTYPE = np.dtype(
+    [
+        ("report_id", "u1"),
+        ("led_color", "u1", (3,)),
+        ("led_effect", "u1"),
+        ("led_duration", "u1"),
+        ("unknown1", "u1", (5,)),
+        ("frequency_byte", "u1"),
+        ("dpi_shift", "u1"),
+        ("dpi_default", "u1"),
+        ("dpis", "u1", (4,)),
+        ("unknown2", "u1", (13,)),
+        ("buttons", "u1", (codec.BUTTON_COUNT, 3)),
+        ("gshift_color", "u1", (3,)),
+        ("gshift_buttons", "u1", (codec.BUTTON_COUNT, 3)),
+    ]
+)
+assert REPORT_DTYPE.itemsize == codec.REPORT_LENGTH
+
+SCALAR_FIELDS = ("report_id", "led_effect", "led_duration", "frequency_byte", "dpi_shift", "dpi_default")
+
+
+def _field_at_offset() -> list[str]:
+    # byte offset -> field name, e.g. 14 -> "dpis[0]", 31 -> "buttons[G1].code"
+    names = [""] * codec.REPORT_LENGTH
+    for field, (dt, offset) in REPORT_DTYPE.fields.items():
+        if dt.shape == ():
+            names[offset] = field
+        elif field.endswith("buttons"):
+            for i in range(dt.itemsize):
+                names[offset + i] = "%s[G%d].%s" % (field, i // 3 + 1, ("code", "modifier", "key")[i % 3])
+        else:
+            for i in range(dt.itemsize):
+                names[offset + i] = "%s[%d]" % (field, i)
+    return names
+
+
+FIELD_AT_OFFSET: list = _field_at_offset()
+
+
+def reports_to_array(reports) -> np.ndarray:
+    # reports: iterable of 154 byte reports (bytes or list of int)
+    data = b"".join(bytes(r) for r in reports)
+    if len(data) % codec.REPORT_LENGTH:
+        raise ValueError("Reports must be %d bytes each" % codec.REPORT_LENGTH)
+    return np.frombuffer(data, dtype=REPORT_DTYPE)
+
+
+def load_array(paths) -> np.ndarray:
+    arrays = []
+    for path in paths:
+        with open(path, "rb") as f:
+            is_text = f.read(1) == b"["
+        if is_text:
+            arrays.append(reports_to_array(iter_report_file(path)))
+        else:
+            # raw dumps map straight onto the dtype, no per-report Python work
+            arr = np.fromfile(path, dtype=np.uint8)
+            if arr.size % codec.REPORT_LENGTH:
+                raise ValueError("%s is not a whole number of reports" % path)
+            arrays.append(arr.view(REPORT_DTYPE))
+    if not arrays:
+        return np.empty(0, dtype=REPORT_DTYPE)
+    return np.concatenate(arrays)
+
+
+def raw_bytes(arr: np.ndarray) -> np.ndarray:
+    # (n, 154) uint8 view of the same memory
+    return np.ascontiguousarray(arr).view(np.uint8).reshape(-1, codec.REPORT_LENGTH)
+
+
+def field_distributions(arr: np.ndarray) -> dict:
+    # value -> count for the scalar fields, each DPI slot, both colors and each
+    # button of both layers (buttons as (code, modifier, key))
+    out = {}
+    for field in SCALAR_FIELDS:
+        values, counts = np.unique(arr[field], return_counts=True)
+        out[field] = dict(zip(values.tolist(), counts.tolist()))
+    for i in range(4):
+        values, counts = np.unique(arr["dpis"][:, i], return_counts=True)
+        out["dpis[%d]" % i] = dict(zip(values.tolist(), counts.tolist()))
+    for field in ("led_color", "gshift_color"):
+        values, counts = np.unique(arr[field], axis=0, return_counts=True)
+        out[field] = {tuple(v): c for v, c in zip(values.tolist(), counts.tolist())}
+    for field in ("buttons", "gshift_buttons"):
+        b = arr[field].astype(np.uint32)
+        packed = (b[:, :, 0] << 16) | (b[:, :, 1] << 8) | b[:, :, 2]  # (n, 20)
+        for i in range(codec.BUTTON_COUNT):
+            values, counts = np.unique(packed[:, i], return_counts=True)
+            out["%s[G%d]" % (field, i + 1)] = {
+                (v >> 16, (v >> 8) & 0xFF, v & 0xFF): c
+                for v, c in zip(values.tolist(), counts.tolist())
+            }
+    return out
+
+
+def differing_bytes(arr: np.ndarray) -> dict:
+    # byte offset -> number of distinct values, only for bytes that are not the same
+    # in every report (this includes the unknown1/unknown2 regions)
+    raw = raw_bytes(arr)
+    if not len(raw):
+        return {}
+    varies = np.flatnonzero((raw != raw[0]).any(axis=0))
+    return {
+        int(offset): int(np.unique(raw[:, offset]).size) for offset in varies
+    }
+
+
+def group_identical(arr: np.ndarray) -> list[tuple[int, np.ndarray]]:
+    # groups of byte-identical reports as (count, indices), largest group first
+    raw = raw_bytes(arr)
+    if not len(raw):
+        return []
+    keys = raw.view(np.dtype((np.void, codec.REPORT_LENGTH))).ravel()
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    order = np.argsort(-counts, kind="stable")
+    sort_by_group = np.argsort(inverse, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    return [
+        (int(counts[g]), sort_by_group[bounds[g] : bounds[g + 1]]) for g in order
+    ]
+
+
+def summary(arr: np.ndarray) -> dict:
+    groups = group_identical(arr)
+    return {
+        "reports": int(len(arr)),
+        "distinct": len(groups),
+        "largest_groups": [
+            {"count": count, "first_index": int(indices[0])} for count, indices in groups[:10]
+        ],
+        "differing_bytes": {
+            "%d %s" % (offset, FIELD_AT_OFFSET[offset]): n
+            for offset, n in differing_bytes(arr).items()
+        },
+        "distributions": {
+            field: {str(k): v for k, v in dist.items()}
+            for field, dist in field_distributions(arr).items()
+            if len(dist) > 1
+        },
+    }
@@ -0,0 +1,181 @@
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+from logitech_g600 import codec
+from logitech_g600.diff import diff_reports
+from logitech_g600.profile import LogitechG600Profile
+from logitech_g600.report import decode
+
+# Micro benchmarks for the profile code paths and an end-to-end apply against
+# simulated devices. Results are JSON so two runs (e.g. two releases) can be
+# compared with --compare.
+#
+#   g600 bench --output before.json
+#   g600 bench --compare before.json
+
+
+def _sample_profile(profile_number: int = 0) -> LogitechG600Profile:
+    profile = LogitechG600Profile(profile_number)
+    profile.color = (255, 0, 0)
+    profile.gshift_color = (0, 255, 255)
+    profile.set_button("g9", value="CTRL+CMD+SHIFT+4")
+    profile.set_gshift_button("g9", value="MEH+1")
+    return profile
+
+
+def _decode_and_read(report: bytes) -> tuple:
+    # what reading a profile back costs: decode, then look at the fields
+    fields = codec.decode_report(report)
+    return (
+        fields.led_color,
+        fields.frequency_byte,
+        fields.dpis,
+        fields.buttons,
+        fields.gshift_buttons,
+    )
+
+
+def measure(name: str, func, params: dict | None = None, repeat: int = 5) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()  # enough calls for at least 0.2 seconds
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "name": name,
+        "params": params or {},
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "ops_per_s": 1 / min(times),
+    }
+
+
+def bench_codec(repeat: int = 5) -> list[dict]:
+    profile = _sample_profile()
+    other = _sample_profile()
+    other.color = (0, 255, 0)
+    report = bytes(profile.feature_report())
+    other_report = bytes(other.feature_report())
+    same_report = bytes(bytearray(report))  # equal, but not the same object
+    # from_report() and feature_report() only copy or return the profile's buffer,
+    # time the unpacking and packing themselves
+    fields = codec.decode_report(report)
+    return [
+        measure("construct", lambda: LogitechG600Profile(0), repeat=repeat),
+        measure("clone", profile.copy, repeat=repeat),
+        measure("encode", lambda: codec.encode_report(fields), repeat=repeat),
+        measure("decode_fields", lambda: codec.decode_report(report), repeat=repeat),
+        measure("decode", lambda: decode(report), repeat=repeat),
+        measure("from_report", lambda: _decode_and_read(report), repeat=repeat),
+        measure(
+            "round_trip",
+            lambda: codec.encode_report(codec.decode_report(report)),
+            repeat=repeat,
+        ),
+        measure("diff_identical", lambda: diff_reports(report, same_report), repeat=repeat),
+        measure("diff_changed", lambda: diff_reports(report, other_report), repeat=repeat),
+    ]
+
+
+def bench_apply(
+    profile_counts=(1, 3), device_counts=(1, 8), latency: float = 0.001, repeat: int = 3
+) -> list[dict]:
+    from logitech_g600.fleet import apply_to_all_devices
+    from logitech_g600.transport import SimulatedBus
+
+    results = []
+    profiles = [_sample_profile(n) for n in range(3)]
+    for device_count in device_counts:
+        for profile_count in profile_counts:
+            times = []
+            for _ in range(repeat):
+                # fresh devices every repeat, so every profile is really written
+                bus = SimulatedBus(count=device_count, latency=latency)
+                start = time.perf_counter()
+                apply_to_all_devices(
+                    profiles[:profile_count],
+                    activate=0,
+                    devices=bus.enumerate(),
+                    open_transport=bus.open_transport,
+                )
+                times.append(time.perf_counter() - start)
+            results.append(
+                {
+                    "name": "apply",
+                    "params": {
+                        "profiles": profile_count,
+                        "devices": device_count,
+                        "latency_s": latency,
+                    },
+                    "number": 1,
+                    "repeat": repeat,
+                    "min_s": min(times),
+                    "median_s": statistics.median(times),
+                    "ops_per_s": 1 / min(times),
+                }
+            )
+    return results
+
+
+def run(quick: bool = False, device_counts=(1, 8), latency: float = 0.001) -> dict:
+    repeat = 3 if quick else 5
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": bench_codec(repeat=repeat)
+        + bench_apply(device_counts=device_counts, latency=latency, repeat=repeat),
+    }
+
+
+def _key(result: dict) -> str:
+    params = ",".join("%s=%s" % kv for kv in sorted(result["params"].items()))
+    return "%s(%s)" % (result["name"], params)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.2) -> list[str]:
+    # names of the benchmarks that got slower than threshold * baseline
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        ratio = r["min_s"] / b["min_s"]
+        print("%-50s %12.3f us %12.3f us  x%.2f" % (_key(r), b["min_s"] * 1e6, r["min_s"] * 1e6, ratio))
+        if ratio > threshold:
+            regressions.append(_key(r))
+    return regressions
+
+
+def format_results(data: dict) -> str:
+    lines = ["%-50s %14s %14s" % ("benchmark", "min", "ops/s")]
+    for r in data["results"]:
+        lines.append("%-50s %11.3f us %14.0f" % (_key(r), r["min_s"] * 1e6, r["ops_per_s"]))
+    return "\n".join(lines)
+
+
+def main(args) -> int:
+    data = run(
+        quick=args.quick, device_counts=tuple(args.devices), latency=args.latency
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), data, args.threshold)
+        for name in regressions:
+            print("regression: %s" % name, file=sys.stderr)
+        return 1 if regressions else 0
+    if args.json:
+        print(json.dumps(data, indent=1))
+    else:
+        print(format_results(data))
+    return 0
@@ -0,0 +1,532 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Only cheap, offline modules are imported here. Anything that talks to the device
+# (and therefore imports hidapi) is imported inside the command that needs it.
+# profiling first, it marks the start of the imports for --perf-output
+from logitech_g600 import profiling
+from logitech_g600.profile_file import (
+    compile_profile_file,
+    compile_profile_files,
+    load_compiled_profiles,
+)
+from logitech_g600.report import decode, iter_report_file, print_feature_report
+
+PROFILE_FILE_SUFFIXES = (".toml", ".json")
+
+
+def load_report_arg(path: str) -> bytes:
+    # a profile file is compiled, anything else is a dump file (first report in it)
+    if Path(path).suffix in PROFILE_FILE_SUFFIXES:
+        return compile_profile_file(path)
+    for report in iter_report_file(path):
+        return report
+    raise ValueError("No report in %s" % path)
+
+
+def cmd_write(args) -> int:
+    profiles = load_compiled_profiles(args.files)
+    if args.all_devices:
+        from logitech_g600.fleet import apply_to_all_devices, format_results
+
+        results = apply_to_all_devices(
+            profiles,
+            activate=args.activate,
+            skip_unchanged=not args.force,
+            metrics=args.metrics,
+            retry=args.retry,
+        )
+        print(format_results(results))
+        return 0 if results and all(r.ok for r in results) else 1
+
+    if args.daemon:
+        from logitech_g600.daemon import DaemonClient
+
+        with DaemonClient(args.socket) as client:
+            result = client.apply(
+                {p.profile_number: p.feature_report() for p in profiles},
+                activate=args.activate,
+                force=args.force,
+            )
+        print("written %s unchanged %s" % (result["written"], result["unchanged"]))
+        return 0
+
+    from logitech_g600.device import G600Session, device_serial_number
+    from logitech_g600.report_cache import WrittenReportCache
+    from logitech_g600.transaction import apply_profiles
+
+    reports = [bytes(p.feature_report()) for p in profiles]
+    cache = WrittenReportCache() if args.cache and not args.force else None
+    if cache is not None and args.activate is None:
+        serial_number = device_serial_number()
+        if all(cache.is_current(serial_number, r) for r in reports):
+            print("Profiles already written, skipping")
+            return 0
+    with G600Session(metrics=args.metrics, retry=args.retry) as session:
+        # one transaction: verified writes, rolled back on failure
+        result = apply_profiles(session, profiles, activate=args.activate, force=args.force)
+        for n in result.unchanged:
+            print("Profile %d unchanged on device, skipping" % n)
+        for n in result.written:
+            print("Successfully wrote profile %d" % n)
+        if result.activated is not None:
+            print("Set profile %d as active profile" % result.activated)
+        retries = sum(session.retries.values())
+        if retries:
+            print("%d retries needed (%s)" % (retries, session.retries))
+        if cache is not None:
+            for report in reports:
+                cache.remember(session.serial_number, report)
+    return 0
+
+
+def cmd_read(args) -> int:
+    if args.files:
+        reports = (report for path in args.files for report in iter_report_file(path))
+    elif args.daemon:
+        from logitech_g600.daemon import DaemonClient
+
+        with DaemonClient(args.socket) as client:
+            reports = [client.read_profile_report(n) for n in args.profile]
+    else:
+        from logitech_g600.device import G600Session
+
+        with G600Session(verbose=not args.json, metrics=args.metrics, retry=args.retry) as session:
+            reports = [session.read_profile_report(n) for n in args.profile]
+    for report in reports:
+        if args.json:
+            print(decode(report).to_json())
+        else:
+            print_feature_report(report)
+    return 0
+
+
+def cmd_activate(args) -> int:
+    if args.daemon:
+        from logitech_g600.daemon import DaemonClient
+
+        with DaemonClient(args.socket) as client:
+            client.set_active_profile(args.profile)
+        print("Set profile %d as active profile" % args.profile)
+        return 0
+
+    from logitech_g600.device import G600Session
+
+    with G600Session(metrics=args.metrics, retry=args.retry) as session:
+        print("Set profile %d as active profile" % args.profile)
+        session.set_active_profile(args.profile)
+    return 0
+
+
+def cmd_active(args) -> int:
+    from logitech_g600.device import G600Session
+    from logitech_g600.profile_watch import ActiveProfileWatcher
+
+    with G600Session(verbose=False, metrics=args.metrics, retry=args.retry) as session:
+        if not args.watch:
+            state = session.read_active_state()
+            print("profile %d resolution %d" % (state.profile, state.resolution))
+            return 0
+        watcher = ActiveProfileWatcher(
+            session, interval=args.interval, input_driven=args.input
+        )
+        try:
+            for state in watcher.changes():
+                print("profile %d resolution %d" % (state.profile, state.resolution), flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def cmd_dump(args) -> int:
+    from logitech_g600.device import G600Session, enumerate_devices
+    from logitech_g600.snapshots import SnapshotStore
+
+    store = SnapshotStore(args.store)
+    devices = enumerate_devices()
+    if not devices:
+        raise ValueError("No G600 attached")
+    for device_dict in devices:
+        with G600Session(
+            path=device_dict["path"], verbose=False, metrics=args.metrics, retry=args.retry
+        ) as session:
+            snapshot = store.take(session)
+        print("%s %s" % (snapshot.serial_number, snapshot.timestamp))
+    return 0
+
+
+def cmd_snapshots(args) -> int:
+    from logitech_g600.snapshots import SnapshotStore
+
+    store = SnapshotStore(args.store)
+    for serial_number in args.serial or store.serial_numbers():
+        for snapshot in store.history(serial_number):
+            print(
+                "%s %s active %s %s"
+                % (
+                    serial_number,
+                    snapshot.timestamp,
+                    "-" if snapshot.active_profile is None else snapshot.active_profile,
+                    " ".join(h[:12] for h in snapshot.hashes),
+                )
+            )
+    return 0
+
+
+def cmd_restore(args) -> int:
+    from logitech_g600.device import G600Session, enumerate_devices
+    from logitech_g600.snapshots import SnapshotStore, restore_snapshot
+
+    store = SnapshotStore(args.store)
+    devices = enumerate_devices()
+    if args.serial:
+        devices = [d for d in devices if d.get("serial_number") == args.serial]
+    if len(devices) != 1:
+        raise ValueError(
+            "%d matching G600s attached, pick one with --serial" % len(devices)
+        )
+    with G600Session(
+        path=devices[0]["path"], metrics=args.metrics, retry=args.retry
+    ) as session:
+        snapshot = store.find(session.serial_number or "unknown", at=args.at)
+        print("Restoring snapshot %s" % snapshot.timestamp)
+        result = restore_snapshot(session, store, snapshot, force=args.force)
+    print("written %s unchanged %s" % (result.written, result.unchanged))
+    return 0
+
+
+def cmd_compile(args) -> int:
+    reports = compile_profile_files(args.files)
+    if args.output:
+        # raw binary, concatenated 154 byte reports
+        with open(args.output, "wb") as f:
+            for report in reports:
+                f.write(report)
+    else:
+        # one list per line, the same format hidapi's get_feature_report prints
+        for report in reports:
+            print(list(report))
+    return 0
+
+
+def cmd_diff(args) -> int:
+    from logitech_g600.diff import diff_reports
+
+    differences = diff_reports(load_report_arg(args.a), load_report_arg(args.b))
+    for change in differences:
+        print(change)
+    return 1 if differences else 0
+
+
+def cmd_validate(args) -> int:
+    from logitech_g600.lint import lint_paths
+
+    results = lint_paths(args.files, jobs=args.jobs)
+    errors = warnings = 0
+    for path, problems in results.items():
+        for problem in problems:
+            print(problem)
+        errors += sum(1 for p in problems if p.severity == "error")
+        warnings += sum(1 for p in problems if p.severity == "warning")
+        if args.verbose and not problems:
+            print("%s: ok" % path)
+    print("%d files, %d errors, %d warnings" % (len(results), errors, warnings))
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+def cmd_analyze(args) -> int:
+    import json
+
+    try:
+        from logitech_g600 import analysis
+    except ImportError as e:
+        raise ValueError(
+            "analyze needs numpy (pip install 'python-hidapi-logitech-g600[analysis]'): %s" % e
+        )
+
+    arr = analysis.load_array(args.files)
+    data = analysis.summary(arr)
+    if args.json:
+        print(json.dumps(data, indent=1))
+        return 0
+    print("%d reports, %d distinct" % (data["reports"], data["distinct"]))
+    for group in data["largest_groups"]:
+        print("  %6d x report #%d" % (group["count"], group["first_index"]))
+    print("differing bytes (offset field: distinct values)")
+    for name, n in data["differing_bytes"].items():
+        print("  %s: %d" % (name, n))
+    print("field distributions (fields with more than one value)")
+    for field, dist in data["distributions"].items():
+        print("  %s: %s" % (field, ", ".join("%s=%d" % kv for kv in dist.items())))
+    return 0
+
+
+def _print_events(session, count: int | None = None) -> None:
+    import asyncio
+
+    from logitech_g600.input_stream import InputStream
+
+    async def consume(stream: InputStream) -> None:
+        subscription = stream.subscribe()
+        reader = asyncio.create_task(stream.run())
+        n = 0
+        async for event in subscription:
+            print(
+                "%.6f buttons=0x%04X x=%d y=%d wheel=%d pan=%d raw=%s"
+                % (event.timestamp, event.buttons, event.x, event.y, event.wheel, event.pan, event.raw.hex())
+            )
+            n += 1
+            if count and n >= count:
+                break
+        stream.stop()
+        await reader
+        if subscription.dropped:
+            print("dropped %d events" % subscription.dropped, file=sys.stderr)
+
+    asyncio.run(consume(InputStream(session)))
+
+
+def cmd_events(args) -> int:
+    from logitech_g600.device import G600Session
+
+    with G600Session(metrics=args.metrics, retry=args.retry) as session:
+        _print_events(session, args.count)
+    return 0
+
+
+def cmd_record(args) -> int:
+    from logitech_g600.device import G600Session
+    from logitech_g600.recording import InputRecorder, record_session
+
+    with G600Session(metrics=args.metrics, retry=args.retry) as session, InputRecorder(args.file) as recorder:
+        try:
+            record_session(session, recorder, seconds=args.seconds)
+        except KeyboardInterrupt:
+            pass
+        print("recorded %d reports to %s" % (recorder.count, args.file))
+    return 0
+
+
+def cmd_replay(args) -> int:
+    from logitech_g600.device import G600Session
+    from logitech_g600.recording import InputLog, ReplayTransport
+
+    with InputLog(args.file) as log:
+        print("%d reports, %.1f seconds" % (len(log), log.duration_ns() / 1e9))
+        transport = ReplayTransport(log, speed=args.speed)
+        with G600Session(transport=transport, verbose=False) as session:
+            _print_events(session, args.count)
+    return 0
+
+
+def cmd_watch(args) -> int:
+    from logitech_g600.hotplug import DeviceWatcher, watch_and_apply
+
+    profiles = load_compiled_profiles(args.files)
+    watcher = DeviceWatcher(
+        poll_interval=args.poll,
+        debounce=args.debounce,
+        use_uevents=not args.poll_only,
+        rescan_interval=args.rescan,
+    )
+    try:
+        watch_and_apply(
+            profiles,
+            activate=args.activate,
+            watcher=watcher,
+            metrics=args.metrics,
+            retry=args.retry,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_daemon(args) -> int:
+    import asyncio
+
+    from logitech_g600.daemon import G600Daemon
+
+    devices = open_transport = None
+    if args.simulate:
+        from logitech_g600.transport import SimulatedBus
+
+        bus = SimulatedBus(count=args.simulate)
+        devices, open_transport = bus.enumerate(), bus.open_transport
+    daemon = G600Daemon(
+        args.socket,
+        devices=devices,
+        open_transport=open_transport,
+        metrics=args.metrics,
+        retry=args.retry,
+    )
+
+    async def serve() -> None:
+        await daemon.start()
+        for serial_number, state in daemon.devices.items():
+            print("%s: active profile %s" % (serial_number, state.active_profile))
+        print("listening on %s" % daemon.socket_path)
+        await daemon.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    return 0
+
+
+def cmd_bench(args) -> int:
+    from logitech_g600 import bench
+
+    return bench.main(args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="g600", description="Logitech G600 onboard profile tool"
+    )
+    parser.add_argument("--metrics-json", metavar="FILE", help="write HID operation latencies as JSON")
+    parser.add_argument("--metrics-prom", metavar="FILE", help="write HID operation latencies as a Prometheus textfile")
+    parser.add_argument("--retries", type=int, default=5, metavar="N", help="tries for open, write and activate (default 5)")
+    parser.add_argument("--retry-deadline", type=float, default=5.0, metavar="SECONDS", help="stop retrying an operation after this long")
+    parser.add_argument("--daemon", action="store_true", help="read, write and activate through a running g600 daemon")
+    parser.add_argument("--socket", metavar="PATH", help="daemon socket (default $XDG_RUNTIME_DIR/logitech_g600.sock)")
+    parser.add_argument("--perf-output", metavar="DIR", help="write cProfile, tracemalloc and startup timings to DIR (or set $G600_PERF_OUTPUT)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("write", help="write profile files to the device")
+    p.add_argument("files", nargs="+", help="profile files (.toml or .json)")
+    p.add_argument("--activate", type=int, choices=range(3), help="profile to activate after writing")
+    p.add_argument("--all-devices", action="store_true", help="write to every attached G600 in parallel")
+    p.add_argument("--force", action="store_true", help="write even if the device already holds the profile")
+    p.add_argument("--cache", action="store_true", help="skip writes already recorded for the device serial")
+    p.set_defaults(func=cmd_write)
+
+    p = commands.add_parser("read", help="print the onboard profiles or decode dump files")
+    p.add_argument("files", nargs="*", help="dump files to decode instead of reading the device")
+    p.add_argument("--profile", type=int, choices=range(3), action="append", help="profile number (default all)")
+    p.add_argument("--json", action="store_true", help="one JSON object per report")
+    p.set_defaults(func=cmd_read)
+
+    p = commands.add_parser("activate", help="set the active profile")
+    p.add_argument("profile", type=int, choices=range(3))
+    p.set_defaults(func=cmd_activate)
+
+    p = commands.add_parser("active", help="print the active profile and resolution")
+    p.add_argument("--watch", action="store_true", help="keep printing changes until Ctrl-C")
+    p.add_argument("--interval", type=float, default=1.0, help="seconds between 0xF0 reads while idle")
+    p.add_argument("--input", action="store_true", help="read 0xF0 when the mouse is used instead of polling")
+    p.set_defaults(func=cmd_active)
+
+    p = commands.add_parser("dump", help="snapshot the profiles of every attached G600")
+    p.add_argument("--store", help="snapshot directory (default $XDG_DATA_HOME/logitech_g600/snapshots)")
+    p.set_defaults(func=cmd_dump)
+
+    p = commands.add_parser("snapshots", help="list stored snapshots")
+    p.add_argument("serial", nargs="*", help="device serial numbers (default all)")
+    p.add_argument("--store", help="snapshot directory")
+    p.set_defaults(func=cmd_snapshots)
+
+    p = commands.add_parser("restore", help="write a stored snapshot back to the device")
+    p.add_argument("--serial", help="device to restore (default the only attached G600)")
+    p.add_argument("--at", metavar="TIMESTAMP", help="latest snapshot at or before this time (default latest)")
+    p.add_argument("--store", help="snapshot directory")
+    p.add_argument("--force", action="store_true", help="write even the profiles already on the device")
+    p.set_defaults(func=cmd_restore)
+
+    p = commands.add_parser("compile", help="compile profile files to reports")
+    p.add_argument("files", nargs="+")
+    p.add_argument("-o", "--output", help="write raw reports to this file instead of printing them")
+    p.set_defaults(func=cmd_compile)
+
+    p = commands.add_parser("diff", help="compare two profiles (profile files or dumps)")
+    p.add_argument("a")
+    p.add_argument("b")
+    p.set_defaults(func=cmd_diff)
+
+    p = commands.add_parser("validate", help="check profile files and dumps")
+    p.add_argument("files", nargs="+", help="profile files, dumps or directories of them")
+    p.add_argument("-j", "--jobs", type=int, help="worker processes (default cpu count, 1 = no pool)")
+    p.add_argument("--strict", action="store_true", help="exit 1 on warnings too")
+    p.add_argument("-v", "--verbose", action="store_true", help="also list the files without problems")
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser("analyze", help="statistics over many dumped reports (needs numpy)")
+    p.add_argument("files", nargs="+", help="dump files (raw 154 byte reports or one list per line)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_analyze)
+
+    p = commands.add_parser("events", help="print decoded input reports (buttons, motion, wheel)")
+    p.add_argument("--count", type=int, help="stop after this many events")
+    p.set_defaults(func=cmd_events)
+
+    p = commands.add_parser("record", help="append input reports to a binary recording")
+    p.add_argument("file")
+    p.add_argument("--seconds", type=float, help="stop after this many seconds (default Ctrl-C)")
+    p.set_defaults(func=cmd_record)
+
+    p = commands.add_parser("replay", help="play a recording back through the event stream")
+    p.add_argument("file")
+    p.add_argument("--speed", type=float, default=1.0, help="1 = original timing, 0 = as fast as possible")
+    p.add_argument("--count", type=int, help="stop after this many events")
+    p.set_defaults(func=cmd_replay)
+
+    p = commands.add_parser("watch", help="apply profile files to every G600 that is plugged in")
+    p.add_argument("files", nargs="+", help="profile files (.toml or .json)")
+    p.add_argument("--activate", type=int, choices=range(3), help="profile to activate")
+    p.add_argument("--poll", type=float, default=2.0, help="seconds between device list checks without uevents")
+    p.add_argument(
+        "--rescan",
+        type=float,
+        default=60.0,
+        help="seconds between device list checks when listening for Linux uevents",
+    )
+    p.add_argument("--debounce", type=float, default=0.5, help="seconds a change must last")
+    p.add_argument("--poll-only", action="store_true", help="don't listen for Linux uevents")
+    p.set_defaults(func=cmd_watch)
+
+    p = commands.add_parser("daemon", help="keep the G600s open and serve clients over a Unix socket")
+    p.add_argument("--simulate", type=int, metavar="N", help="serve N simulated devices instead")
+    p.set_defaults(func=cmd_daemon)
+
+    p = commands.add_parser("bench", help="benchmark encode/decode and simulated apply")
+    p.add_argument("--output", help="write the results as JSON to this file")
+    p.add_argument("--json", action="store_true", help="print the results as JSON")
+    p.add_argument("--compare", help="JSON results of an earlier run, exit 1 on regressions")
+    p.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio counted as a regression")
+    p.add_argument("--devices", type=int, nargs="+", default=[1, 8], help="simulated device counts")
+    p.add_argument("--latency", type=float, default=0.001, help="simulated seconds per HID operation")
+    p.add_argument("--quick", action="store_true", help="fewer repeats")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return profiling.run(_run, args.command, args.perf_output, args)
+
+
+def _run(args) -> int:
+    if getattr(args, "profile", None) is None and args.command == "read":
+        args.profile = [0, 1, 2]
+    from logitech_g600.retry import RetryPolicy
+
+    args.retry = RetryPolicy(max_attempts=max(1, args.retries), deadline=args.retry_deadline)
+    args.metrics = None
+    if args.metrics_json or args.metrics_prom:
+        from logitech_g600.metrics import LatencyMetrics
+
+        args.metrics = LatencyMetrics()
+    try:
+        return args.func(args)
+    except (ValueError, OSError) as e:
+        print("error: %s" % e, file=sys.stderr)
+        return 1
+    finally:
+        if args.metrics_json:
+            args.metrics.write_json(args.metrics_json)
+        if args.metrics_prom:
+            args.metrics.write_prometheus(args.metrics_prom)
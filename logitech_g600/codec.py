@@ -0,0 +1,105 @@
+import struct
+from itertools import chain
+from typing import NamedTuple
+
+# Layout of the 154 byte profile feature report (report id included), see README.md
+#
+#   byte    0      report id (0xF3, 0xF4, 0xF5)
+#   bytes   1-3    led red, green, blue
+#   byte    4      led effect
+#   byte    5      led duration
+#   bytes   6-10   unknown1
+#   byte   11      USB report rate (frequency = 1000 / (1 + value))
+#   byte   12      DPI shift value (* 50 dpi)
+#   byte   13      DPI default index (0-3)
+#   bytes  14-17   DPI values 1-4 (* 50 dpi)
+#   bytes  18-30   unknown2
+#   bytes  31-90   G1-G20 (code, modifier, key)
+#   bytes  91-93   G-shift color red, green, blue
+#   bytes  94-153  G-shift G1-G20 (code, modifier, key)
+
+REPORT_LENGTH: int = 154
+BUTTON_COUNT: int = 20
+
+HEADER = struct.Struct("<B3BBB5sBBB4B13s")
+GSHIFT_COLOR = struct.Struct("<3B")
+BUTTON = struct.Struct("<BBB")
+# the whole report in one precompiled struct: 15 header values, 60 button bytes,
+# 3 G-shift color bytes, 60 G-shift button bytes
+REPORT = struct.Struct(HEADER.format + "60B3B60B")
+_B = 15  # index of the first button byte in REPORT.unpack() values
+_GC = _B + 60  # index of the G-shift color
+_GB = _GC + 3  # index of the first G-shift button byte
+
+OFFSET_BUTTONS: int = HEADER.size  # 31
+OFFSET_GSHIFT_COLOR: int = OFFSET_BUTTONS + BUTTON_COUNT * BUTTON.size  # 91
+OFFSET_GSHIFT_BUTTONS: int = OFFSET_GSHIFT_COLOR + GSHIFT_COLOR.size  # 94
+
+UNKNOWN1: bytes = bytes(5)
+UNKNOWN2: bytes = bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+
+FREQUENCY_TO_BYTE: dict = {1000: 0x00, 500: 0x01, 250: 0x03, 125: 0x07}
+BYTE_TO_FREQUENCY: dict = {v: k for k, v in FREQUENCY_TO_BYTE.items()}
+
+assert OFFSET_GSHIFT_BUTTONS + BUTTON_COUNT * BUTTON.size == REPORT_LENGTH
+
+
+class ReportFields(NamedTuple):
+    # raw byte values of a profile report, no unit conversion
+    report_id: int
+    led_color: tuple  # (red, green, blue)
+    led_effect: int
+    led_duration: int
+    frequency_byte: int
+    dpi_shift: int  # value * 50 = dpi
+    dpi_default: int  # index in dpis
+    dpis: tuple  # 4 values, value * 50 = dpi
+    buttons: tuple  # 20 (code, modifier, key) tuples
+    gshift_color: tuple  # (red, green, blue)
+    gshift_buttons: tuple  # 20 (code, modifier, key) tuples
+    unknown1: bytes = UNKNOWN1
+    unknown2: bytes = UNKNOWN2
+
+
+def encode_report(fields: ReportFields) -> bytes:
+    if len(fields.buttons) != BUTTON_COUNT or len(fields.gshift_buttons) != BUTTON_COUNT:
+        raise ValueError("A profile report needs %d buttons per layer" % BUTTON_COUNT)
+    return REPORT.pack(
+        fields.report_id,
+        *fields.led_color,
+        fields.led_effect,
+        fields.led_duration,
+        fields.unknown1,
+        fields.frequency_byte,
+        fields.dpi_shift,
+        fields.dpi_default,
+        *fields.dpis,
+        fields.unknown2,
+        *chain.from_iterable(fields.buttons),
+        *fields.gshift_color,
+        *chain.from_iterable(fields.gshift_buttons),
+    )
+
+
+def decode_report(data) -> ReportFields:
+    # data: bytes, bytearray, memoryview or the list of int returned by hidapi
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+    if len(data) != REPORT_LENGTH:
+        raise ValueError("Invalid feature report length %d" % len(data))
+    v = REPORT.unpack(data)
+    return ReportFields(
+        report_id=v[0],
+        led_color=v[1:4],
+        led_effect=v[4],
+        led_duration=v[5],
+        frequency_byte=v[7],
+        dpi_shift=v[8],
+        dpi_default=v[9],
+        dpis=v[10:14],
+        buttons=tuple(zip(v[_B:_GC:3], v[_B + 1 : _GC : 3], v[_B + 2 : _GC : 3])),
+        gshift_color=v[_GC:_GB],
+        gshift_buttons=tuple(zip(v[_GB::3], v[_GB + 1 :: 3], v[_GB + 2 :: 3])),
+        unknown1=v[6],
+        unknown2=v[14],
+    )
@@ -0,0 +1,297 @@
+import asyncio
+import errno
+import json
+import os
+import socket
+
+from logitech_g600.device import G600Session, enumerate_devices
+from logitech_g600.errors import ApplyError, DaemonError
+from logitech_g600.retry import DEFAULT_RETRY, RetryPolicy
+from logitech_g600.transaction import apply_profiles
+from logitech_g600.transport import PROFILE_REPORT_IDS
+
+# A daemon that keeps every G600 open and serves clients over a Unix domain socket.
+#
+# The three profile reports and the active profile of each device are cached in
+# memory, reads are answered from the cache without device I/O. Writes and
+# activation go to the device (as one apply_profiles transaction), one request at
+# a time per device, and update the cache.
+#
+# Protocol: one JSON object per line each way. Reports are hex strings.
+#
+#   {"op": "devices"}
+#   {"op": "read", "profile": 0, "serial": "...", "fresh": false}
+#   {"op": "write", "reports": {"0": "f3..."}, "activate": 0, "force": false}
+#   {"op": "activate", "profile": 1}
+#   {"op": "refresh"}                          re-read the cache from the device
+#
+# "serial" may be left out when a single G600 is attached. Every response has
+# "ok", and "error" when ok is false.
+#
+#   g600 daemon &
+#   g600 --daemon read --profile 0
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "logitech_g600.sock")
+    return "/tmp/logitech_g600-%d.sock" % os.getuid()
+
+
+def _remove_stale_socket(path: str) -> None:
+    # a socket file nobody listens on is left over by a daemon that did not exit
+    # cleanly, a live one belongs to another daemon
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except FileNotFoundError:
+        return
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        sock.close()
+    raise OSError(errno.EADDRINUSE, "Another daemon is listening on %s" % path)
+
+
+class DeviceState:
+    def __init__(self, session: G600Session):
+        self.session = session
+        self.serial_number = session.serial_number
+        self.reports = {}  # profile number -> 154 byte report
+        self.active_profile = None
+        self.lock = asyncio.Lock()  # one device operation at a time
+
+    def refresh(self) -> None:
+        # blocking, runs in a worker thread
+        self.reports = {
+            n: bytes(self.session.read_profile_report(n))
+            for n in range(len(PROFILE_REPORT_IDS))
+        }
+        self.active_profile = self.session.read_active_profile()
+
+    def info(self) -> dict:
+        return {
+            "serial": self.serial_number,
+            "product": self.session.product,
+            "active_profile": self.active_profile,
+        }
+
+
+class G600Daemon:
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        devices: list[dict] | None = None,
+        open_transport=None,
+        metrics=None,
+        retry: RetryPolicy = DEFAULT_RETRY,
+    ):
+        # devices / open_transport as in fleet.apply_to_all_devices
+        self.socket_path = socket_path or default_socket_path()
+        self.devices = {}  # serial number -> DeviceState
+        self._device_dicts = devices
+        self._open_transport = open_transport
+        self._metrics = metrics
+        self._retry = retry
+        self._server = None
+
+    def _open_device(self, device_dict: dict) -> DeviceState:
+        session = G600Session(
+            path=device_dict["path"],
+            verbose=False,
+            transport=self._open_transport(device_dict) if self._open_transport else None,
+            metrics=self._metrics,
+            retry=self._retry,
+        ).open()
+        state = DeviceState(session)
+        try:
+            state.refresh()
+        except BaseException:
+            session.close()
+            raise
+        return state
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        device_dicts = self._device_dicts
+        if device_dicts is None:
+            device_dicts = await loop.run_in_executor(None, enumerate_devices)
+        _remove_stale_socket(self.socket_path)
+        for device_dict in device_dicts:
+            try:
+                state = await loop.run_in_executor(None, self._open_device, device_dict)
+            except OSError as e:
+                # one bad G600 doesn't keep the others from being served
+                name = device_dict.get("serial_number") or device_dict["path"]
+                print("skipping %s: %s" % (name, e))
+                continue
+            self.devices[state.serial_number or device_dict["path"].decode()] = state
+        self._server = await asyncio.start_unix_server(self._handle_client, self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        for state in self.devices.values():
+            state.session.close()
+        self.devices = {}
+
+    async def _handle_client(self, reader, writer) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _device(self, serial_number: str | None) -> DeviceState:
+        if serial_number is not None:
+            if serial_number not in self.devices:
+                raise ValueError("No G600 with serial number %s" % serial_number)
+            return self.devices[serial_number]
+        if len(self.devices) != 1:
+            raise ValueError("%d G600 attached, give a serial" % len(self.devices))
+        return next(iter(self.devices.values()))
+
+    async def _run(self, state: DeviceState, func, *args):
+        async with state.lock:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def dispatch(self, request: dict) -> dict:
+        if not isinstance(request, dict):
+            raise ValueError("A request must be a JSON object")
+        op = request.get("op")
+        if op == "devices":
+            return {"ok": True, "devices": [s.info() for s in self.devices.values()]}
+        state = self._device(request.get("serial"))
+        if op == "read":
+            profile_number = request["profile"]
+            if profile_number not in state.reports:
+                raise ValueError("Invalid profile number %s" % profile_number)
+            if request.get("fresh"):
+                await self._run(state, state.refresh)
+            return {"ok": True, "report": state.reports[profile_number].hex()}
+        if op == "write":
+            if not isinstance(request["reports"], dict):
+                raise ValueError("reports must be a JSON object of profile number: hex report")
+            reports = {int(n): bytes.fromhex(r) for n, r in request["reports"].items()}
+            return await self._run(
+                state, self._write, state, reports, request.get("activate"), request.get("force", False)
+            )
+        if op == "activate":
+            return await self._run(state, self._write, state, {}, request["profile"], False)
+        if op == "refresh":
+            await self._run(state, state.refresh)
+            return {"ok": True, **state.info()}
+        raise ValueError("Unknown op %s" % op)
+
+    def _write(self, state: DeviceState, reports: dict, activate: int | None, force: bool) -> dict:
+        # blocking, runs in a worker thread while holding the device lock
+        if activate is not None:
+            # the profile buttons change it behind the cache's back, a rollback must
+            # restore what is really active
+            state.active_profile = state.session.read_active_profile()
+        try:
+            # the cache is the snapshot, no 3 profile + 0xF0 reads per request
+            result = apply_profiles(
+                state.session,
+                reports,
+                activate=activate,
+                force=force,
+                snapshot=state.reports,
+                previous_active=state.active_profile,
+            )
+        except ApplyError as e:
+            # the snapshot was restored (or not), only the device knows for sure
+            state.refresh()
+            return {"ok": False, "error": str(e), "rolled_back": e.result.rolled_back}
+        for n in result.written:
+            state.reports[n] = reports[n]
+        if result.activated is not None:
+            state.active_profile = result.activated
+        return {
+            "ok": True,
+            "written": result.written,
+            "unchanged": result.unchanged,
+            "activated": result.activated,
+        }
+
+
+class DaemonClient:
+    # Blocking client for G600Daemon
+    #
+    #   with DaemonClient() as client:
+    #       report = client.read_profile_report(0)
+
+    def __init__(self, socket_path: str | None = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, op: str, **kwargs) -> dict:
+        self._file.write(json.dumps({"op": op, **kwargs}).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise DaemonError("daemon closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise DaemonError(response["error"])
+        return response
+
+    def devices(self) -> list[dict]:
+        return self.request("devices")["devices"]
+
+    def read_profile_report(
+        self, profile_number: int, serial: str | None = None, fresh: bool = False
+    ) -> bytes:
+        response = self.request("read", profile=profile_number, serial=serial, fresh=fresh)
+        return bytes.fromhex(response["report"])
+
+    def apply(
+        self,
+        reports: dict,
+        activate: int | None = None,
+        force: bool = False,
+        serial: str | None = None,
+    ) -> dict:
+        # reports: profile number -> report
+        return self.request(
+            "write",
+            reports={str(n): bytes(r).hex() for n, r in reports.items()},
+            activate=activate,
+            force=force,
+            serial=serial,
+        )
+
+    def set_active_profile(self, profile_number: int, serial: str | None = None) -> dict:
+        return self.request("activate", profile=profile_number, serial=serial)
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,288 @@
+import time
+from typing import NamedTuple
+
+from logitech_g600.errors import ActivateError, DeviceOpenError, ReadError, WriteError
+from logitech_g600.metrics import LatencyMetrics
+from logitech_g600.retry import DEFAULT_RETRY, RetryPolicy
+from logitech_g600.transport import (
+    ACTIVE_PROFILE_REPORT_ID,
+    PRODUCT_ID,
+    PROFILE_REPORT_IDS,
+    VENDOR_ID,
+    HidapiTransport,
+    Transport,
+)
+
+PROFILE_REPORT_LENGTH: int = 154
+ACTIVE_PROFILE_REPORT_LENGTH: int = 4
+
+
+class ActiveProfile(NamedTuple):
+    profile: int  # 0-2
+    resolution: int  # index of the DPI in use (0-3), the DPI shift is not reported
+
+
+def decode_active_profile(data) -> ActiveProfile:
+    # 0xF0 report: [0xF0, profile << 4 | resolution << 1, 0, 0]
+    if not data or data[0] != ACTIVE_PROFILE_REPORT_ID or len(data) < 2:
+        raise ValueError("Invalid active profile report %s" % (list(data or []),))
+    return ActiveProfile(profile=(data[1] >> 4) & 0x07, resolution=(data[1] >> 1) & 0x03)
+
+
+def _hid():
+    # hidapi is only imported when a device is actually used, offline commands
+    # (compile, diff, validate) never load it
+    import hid
+
+    return hid
+
+
+class G600Session:
+    # One open handle to the G600 shared by read, write and activate operations.
+    #
+    # Instead of sleeping a fixed 2 seconds after every open, the session polls the
+    # 0xF0 (active profile) feature report until the mouse answers, bounded by
+    # ready_timeout seconds.
+    #
+    #   with G600Session() as session:
+    #       profile.write_to_device(session)
+    #       profile.set_as_active_profile(session)
+    #
+    # The device I/O goes through a Transport, hidapi by default, or e.g. a
+    # SimulatedG600 from logitech_g600.transport. With metrics every operation is
+    # timed into a LatencyMetrics (logitech_g600.metrics).
+    #
+    # open, feature report reads, profile writes and activation are retried with
+    # the retry policy (logitech_g600.retry) and raise DeviceOpenError, ReadError,
+    # WriteError or ActivateError once it gives up. self.retries counts the retries
+    # per operation.
+
+    def __init__(
+        self,
+        path: bytes | None = None,
+        ready_timeout: float = 2.0,
+        poll_interval: float = 0.05,
+        verbose: bool = True,
+        transport: Transport | None = None,
+        metrics: LatencyMetrics | None = None,
+        retry: RetryPolicy = DEFAULT_RETRY,
+    ):
+        self.path = path
+        self.transport = transport
+        self.metrics = metrics
+        self.retry = retry
+        self.retries = {"open": 0, "read": 0, "write": 0, "activate": 0}
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+        self.manufacturer = None
+        self.product = None
+        self.serial_number = None
+        self._h = None
+
+    def _log(self, *args) -> None:
+        if self.verbose:
+            print(*args)
+
+    @property
+    def is_open(self) -> bool:
+        return self._h is not None
+
+    def open(self) -> "G600Session":
+        if self._h is not None:
+            return self
+        self._log("Opening device vendor 0x046D (Logitech) product 0xC24A (G600)")
+        if self.transport is None:
+            self.transport = HidapiTransport(self.path)
+        h = self.transport
+        try:
+            _, self.retries["open"] = self.retry.call(
+                self._timed_open,
+                error=DeviceOpenError,
+                message="error opening device vendor 0x046D (Logitech) product 0xC24A (G600)",
+            )
+        except DeviceOpenError:
+            self._log("Close Logitech GHUB, Karabiner, Hammerspoon, etc.")
+            self._log(
+                "The terminal application must have input monitoring permission in System Preferences > Security & Privacy > Privacy > Input Monitoring"
+            )
+            self._log(
+                "The terminal application must have input monitoring permission in System Settings > Privacy & Security > Input Monitoring"
+            )
+            raise
+        except BaseException:
+            # e.g. from a metrics observer after the transport opened
+            h.close()
+            raise
+        self._h = h
+        try:
+            self.manufacturer = h.manufacturer
+            self.product = h.product
+            self.serial_number = h.serial_number
+            self._log("Manufacturer: %s" % self.manufacturer)
+            self._log("Product: %s" % self.product)
+            self._log("Serial No: %s" % self.serial_number)
+            self._call("ready_wait", self.wait_until_ready)
+        except BaseException:
+            # __exit__ doesn't run when __enter__ raises, don't leak the handle
+            self.close()
+            raise
+        return self
+
+    def _timed_open(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.transport.open()
+        except OSError:
+            if self.metrics is not None:
+                self.metrics.observe(
+                    self.transport.serial_number, "open", time.perf_counter() - start, error=True
+                )
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(
+                self.transport.serial_number, "open", time.perf_counter() - start
+            )
+
+    def close(self) -> None:
+        if self._h is not None:
+            self._h.close()
+            self._h = None
+
+    def __enter__(self) -> "G600Session":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _handle(self):
+        if self._h is None:
+            raise ValueError("Session is not open")
+        return self._h
+
+    def _call(self, operation: str, func, *args):
+        if self.metrics is None:
+            return func(*args)
+        start = time.perf_counter()
+        try:
+            rc = func(*args)
+        except BaseException:
+            self.metrics.observe(
+                self.serial_number, operation, time.perf_counter() - start, error=True
+            )
+            raise
+        self.metrics.observe(
+            self.serial_number, operation, time.perf_counter() - start, error=rc == -1
+        )
+        return rc
+
+    def wait_until_ready(self) -> bool:
+        # other profile writes may be in progress/pending, probe the device until it
+        # answers a feature report instead of sleeping a fixed amount of time
+        h = self._handle()
+        deadline = time.monotonic() + self.ready_timeout
+        while True:
+            try:
+                d = h.get_feature_report(
+                    ACTIVE_PROFILE_REPORT_ID, ACTIVE_PROFILE_REPORT_LENGTH
+                )
+                if d and d[0] == ACTIVE_PROFILE_REPORT_ID:
+                    return True
+            except (OSError, ValueError):
+                pass
+            if time.monotonic() >= deadline:
+                self._log(
+                    "device did not answer within %.1f seconds, continuing anyway"
+                    % self.ready_timeout
+                )
+                return False
+            time.sleep(self.poll_interval)
+
+    def read_profile_report(self, profile_number: int) -> list[int]:
+        if profile_number not in range(len(PROFILE_REPORT_IDS)):
+            raise ValueError("Invalid profile number %d" % profile_number)
+        return self._read_feature_report(
+            PROFILE_REPORT_IDS[profile_number], PROFILE_REPORT_LENGTH
+        )
+
+    def _read_feature_report(self, report_id: int, length: int) -> list[int]:
+        d, retries = self.retry.call(
+            self._call,
+            "get_feature_report",
+            self._handle().get_feature_report,
+            report_id,
+            length,
+            error=ReadError,
+            message="error reading report 0x%02X" % report_id,
+        )
+        self.retries["read"] += retries
+        return d
+
+    def read_active_state(self) -> ActiveProfile:
+        # active profile and resolution, from the 0xF0 report
+        d = self._read_feature_report(
+            ACTIVE_PROFILE_REPORT_ID, ACTIVE_PROFILE_REPORT_LENGTH
+        )
+        try:
+            return decode_active_profile(d)
+        except ValueError as e:
+            raise ReadError(str(e))
+
+    def read_active_profile(self) -> int:
+        return self.read_active_state().profile
+
+    def read_input_report(self, length: int = 8, timeout_ms: int = 0) -> list[int]:
+        # one input report (buttons/motion), [] if none within timeout_ms
+        return self._call("read_input", self._handle().read, length, timeout_ms)
+
+    def write_profile_report(self, report: bytes | list[int]) -> int:
+        # returns the number of bytes written, raises WriteError if every try failed
+        rc, retries = self.retry.call(
+            self._call,
+            "send_feature_report",
+            self._handle().send_feature_report,
+            report,
+            error=WriteError,
+            message="error writing profile report 0x%02X" % report[0],
+        )
+        self.retries["write"] += retries
+        return rc
+
+    def set_active_profile(self, profile_number: int) -> int:
+        if profile_number not in range(len(PROFILE_REPORT_IDS)):
+            raise ValueError("Invalid profile number %d" % profile_number)
+        # 0xF0: the report id to set the active profile
+        # - [0xF0, 0x80, 0x00, 0x00] for profile 1 (0x80 | (index << 4)) index: 0, 0x80 = b10000000
+        # - [0xF0, 0x90, 0x00, 0x00] for profile 2 (0x80 | (index << 4)) index: 1, 0x90 = b10010000
+        # - [0xF0, 0xa0, 0x00, 0x00] for profile 3 (0x80 | (index << 4)) index: 2, 0xa0 = b10100000
+        rc, retries = self.retry.call(
+            self._call,
+            "send_feature_report",
+            self._handle().send_feature_report,
+            [ACTIVE_PROFILE_REPORT_ID, 0x80 | (profile_number << 4), 0x00, 0x00],
+            error=ActivateError,
+            message="error setting profile %d as active profile" % profile_number,
+        )
+        self.retries["activate"] += retries
+        return rc
+
+
+def enumerate_devices() -> list[dict]:
+    # One entry per attached G600. The mouse exposes several HID interfaces with the
+    # same serial number, keep the first one of each (the one hid.open() would pick)
+    devices = []
+    seen = set()
+    for device_dict in _hid().enumerate(VENDOR_ID, PRODUCT_ID):
+        key = device_dict.get("serial_number") or device_dict["path"]
+        if key in seen:
+            continue
+        seen.add(key)
+        devices.append(device_dict)
+    return devices
+
+
+def device_serial_number() -> str | None:
+    # serial number of the device G600Session() would open, without opening it
+    for device_dict in _hid().enumerate(VENDOR_ID, PRODUCT_ID):
+        return device_dict.get("serial_number") or None
+    return None
@@ -0,0 +1,112 @@
+from typing import NamedTuple
+
+from logitech_g600 import codec, keys
+from logitech_g600.profile_file import LED_EFFECTS
+
+# Field by field comparison of two profile reports, e.g. a compiled profile file
+# against what the device reads back.
+#
+# Identical reports cost one bytes comparison (memcmp), only reports that differ are
+# split into fields, and only the fields that differ are decoded. Field names are the
+# profile file keys (color, dpi1, buttons.G9, gshift_buttons.G9, ...).
+#
+#   for change in diff_reports(compile_profile_file("profile0.toml"), device_report):
+#       print(change)
+
+EFFECT_NAMES: dict = {v: k for k, v in LED_EFFECTS.items()}
+
+
+class FieldChange(NamedTuple):
+    field: str
+    offset: int  # first byte of the field in the report
+    before: str
+    after: str
+
+    def __str__(self) -> str:
+        return "%s: %s -> %s" % (self.field, self.before, self.after)
+
+
+def _color(b: bytes) -> str:
+    return "#%02x%02x%02x" % tuple(b)
+
+
+def _byte(b: bytes) -> str:
+    return str(b[0])
+
+
+def _raw(b: bytes) -> str:
+    return str(list(b))
+
+
+def _effect(b: bytes) -> str:
+    return EFFECT_NAMES.get(b[0], str(b[0]))
+
+
+def _frequency(b: bytes) -> str:
+    hz = codec.BYTE_TO_FREQUENCY.get(b[0])
+    return "%d Hz" % hz if hz else "byte %d" % b[0]
+
+
+def _dpi(b: bytes) -> str:
+    return "%d dpi" % (b[0] * 50)
+
+
+def _binding(b: bytes) -> str:
+    return keys.binding_name(*b) or "(0x%02X, 0x%02X, 0x%02X)" % tuple(b)
+
+
+def _fields() -> tuple:
+    # (name, start, end, format) in report order
+    fields = [
+        ("report_id", 0, 1, _byte),
+        ("color", 1, 4, _color),
+        ("led_effect", 4, 5, _effect),
+        ("led_duration", 5, 6, _byte),
+        ("unknown1", 6, 11, _raw),
+        ("frequency", 11, 12, _frequency),
+        ("dpi_shift", 12, 13, _dpi),
+        ("dpi_default", 13, 14, _byte),
+    ]
+    fields += [("dpi%d" % (i + 1), 14 + i, 15 + i, _dpi) for i in range(4)]
+    fields.append(("unknown2", 18, codec.OFFSET_BUTTONS, _raw))
+    for i in range(codec.BUTTON_COUNT):
+        start = codec.OFFSET_BUTTONS + i * codec.BUTTON.size
+        fields.append(("buttons.G%d" % (i + 1), start, start + codec.BUTTON.size, _binding))
+    fields.append(
+        ("gshift_color", codec.OFFSET_GSHIFT_COLOR, codec.OFFSET_GSHIFT_BUTTONS, _color)
+    )
+    for i in range(codec.BUTTON_COUNT):
+        start = codec.OFFSET_GSHIFT_BUTTONS + i * codec.BUTTON.size
+        fields.append(
+            ("gshift_buttons.G%d" % (i + 1), start, start + codec.BUTTON.size, _binding)
+        )
+    return tuple(fields)
+
+
+FIELDS: tuple = _fields()
+
+assert FIELDS[-1][2] == codec.REPORT_LENGTH
+
+
+def _as_bytes(data) -> bytes:
+    # bytes, bytearray, memoryview or the list of int returned by hidapi
+    return data if isinstance(data, bytes) else bytes(data)
+
+
+def reports_equal(a, b) -> bool:
+    return _as_bytes(a) == _as_bytes(b)
+
+
+def diff_reports(a, b) -> list[FieldChange]:
+    # the fields of report b that differ from report a, [] if they are identical
+    a = _as_bytes(a)
+    b = _as_bytes(b)
+    if a == b:
+        return []
+    if len(a) != codec.REPORT_LENGTH or len(b) != codec.REPORT_LENGTH:
+        raise ValueError("Invalid feature report length %d/%d" % (len(a), len(b)))
+    return [
+        FieldChange(name, start, fmt(a[start:end]), fmt(b[start:end]))
+        for name, start, end, fmt in FIELDS
+        if a[start:end] != b[start:end]
+    ]
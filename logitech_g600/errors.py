@@ -0,0 +1,36 @@
+# Exceptions raised by device operations. They are OSError subclasses, so code that
+# already handles hidapi's OSError handles these as well.
+
+
+class G600Error(OSError):
+    def __init__(self, message: str, attempts: int = 1):
+        super().__init__(message)
+        self.attempts = attempts  # tries made, 1 = no retry
+
+
+class DeviceOpenError(G600Error):
+    pass
+
+
+class ReadError(G600Error):
+    pass
+
+
+class WriteError(G600Error):
+    pass
+
+
+class ActivateError(G600Error):
+    pass
+
+
+class DaemonError(G600Error):
+    # an error reported by the g600 daemon (logitech_g600.daemon) to a client
+    pass
+
+
+class ApplyError(G600Error):
+    # a transactional apply failed, result.rolled_back tells if the device was restored
+    def __init__(self, message: str, result):
+        super().__init__(message)
+        self.result = result
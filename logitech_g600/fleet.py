@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from logitech_g600.device import G600Session, enumerate_devices
+from logitech_g600.retry import DEFAULT_RETRY, RetryPolicy
+from logitech_g600.transaction import ApplyError, apply_profiles
+
+
+@dataclass
+class DeviceResult:
+    path: bytes
+    serial_number: str | None
+    written: list[int] = field(default_factory=list)  # profile numbers sent
+    unchanged: list[int] = field(default_factory=list)  # profile numbers skipped
+    activated: int | None = None
+    retries: int = 0  # retried open/write/activate tries
+    rolled_back: bool = False  # a failed apply was undone on this device
+    elapsed: float = 0.0  # seconds, including open and readiness wait
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _apply_to_device(
+    device_dict: dict,
+    reports: dict[int, bytes],
+    activate: int | None,
+    skip_unchanged: bool,
+    ready_timeout: float,
+    open_transport,
+    metrics,
+    retry,
+) -> DeviceResult:
+    result = DeviceResult(
+        path=device_dict["path"], serial_number=device_dict.get("serial_number")
+    )
+    start = time.monotonic()
+    session = G600Session(
+        path=device_dict["path"],
+        ready_timeout=ready_timeout,
+        verbose=False,
+        transport=open_transport(device_dict) if open_transport else None,
+        metrics=metrics,
+        retry=retry,
+    )
+    try:
+        with session:
+            applied = apply_profiles(
+                session, reports, activate=activate, force=not skip_unchanged
+            )
+            result.written = applied.written
+            result.unchanged = applied.unchanged
+            result.activated = applied.activated
+    except ApplyError as e:
+        result.error = str(e)
+        result.rolled_back = e.result.rolled_back
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+    result.retries = sum(session.retries.values())
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def apply_to_all_devices(
+    profiles,
+    activate: int | None = None,
+    skip_unchanged: bool = True,
+    max_workers: int | None = None,
+    ready_timeout: float = 2.0,
+    devices: list[dict] | None = None,
+    open_transport=None,
+    metrics=None,
+    retry: RetryPolicy = DEFAULT_RETRY,
+) -> list[DeviceResult]:
+    # Write profiles (LogitechG600Profile instances) to every attached G600 in
+    # parallel, one worker and one session per device.
+    # open_transport(device_dict) -> Transport replaces hidapi, e.g. with a
+    # SimulatedBus from logitech_g600.transport
+    # metrics: a LatencyMetrics shared by every device session
+    if devices is None:
+        devices = enumerate_devices()
+    if not devices:
+        return []
+    # compile once, every device gets the same bytes
+    reports = {p.profile_number: bytes(p.feature_report()) for p in profiles}
+    with ThreadPoolExecutor(max_workers=max_workers or len(devices)) as pool:
+        return list(
+            pool.map(
+                lambda d: _apply_to_device(
+                    d,
+                    reports,
+                    activate,
+                    skip_unchanged,
+                    ready_timeout,
+                    open_transport,
+                    metrics,
+                    retry,
+                ),
+                devices,
+            )
+        )
+
+
+def format_results(results: list[DeviceResult]) -> str:
+    lines = [
+        "%-20s %-20s %-8s %-10s %-8s %7s %8s  %s"
+        % ("serial", "path", "written", "unchanged", "active", "retries", "seconds", "error")
+    ]
+    for r in results:
+        lines.append(
+            "%-20s %-20s %-8s %-10s %-8s %7d %8.3f  %s"
+            % (
+                r.serial_number or "-",
+                r.path.decode(errors="replace"),
+                ",".join(str(n) for n in r.written) or "-",
+                ",".join(str(n) for n in r.unchanged) or "-",
+                "-" if r.activated is None else r.activated,
+                r.retries,
+                r.elapsed,
+                r.error or "",
+            )
+        )
+    return "\n".join(lines)
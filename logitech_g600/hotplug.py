@@ -0,0 +1,176 @@
+import select
+import socket
+import sys
+import time
+from dataclasses import dataclass
+
+from logitech_g600.device import G600Session, enumerate_devices
+from logitech_g600.retry import DEFAULT_RETRY, RetryPolicy
+from logitech_g600.transaction import apply_profiles
+
+# Notice G600s being plugged in and out (USB, KVM switches) and re-apply profiles.
+#
+# On Linux the watcher sleeps on the kernel's uevent netlink socket (what udev
+# listens to) and wakes up for events of a 046D:C24A device, or every
+# rescan_interval seconds (default a minute) as a safety net for missed events.
+# Elsewhere, or if the socket cannot be opened, it polls every poll_interval seconds. Either way the attached devices are then listed with hid.enumerate() and
+# compared with the previous list. Changes are reported after debounce seconds
+# without further events, so a flapping connection is reported once, or not at
+# all if it ends up where it started.
+#
+#   for event in DeviceWatcher().events():
+#       print(event.action, event.key)
+
+NETLINK_KOBJECT_UEVENT: int = 15
+UEVENT_MATCHES: tuple = (b"046D:C24A", b"PRODUCT=46D/C24A")
+
+
+@dataclass(frozen=True)
+class HotplugEvent:
+    action: str  # "add" or "remove"
+    key: str  # serial number, or the path if the device has none
+    device: dict  # the hid.enumerate() entry
+
+
+def _device_key(device_dict: dict) -> str:
+    return device_dict.get("serial_number") or device_dict["path"].decode(errors="replace")
+
+
+def _open_uevent_socket():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, 1))  # port id chosen by the kernel, group 1: kernel uevents
+    except OSError:
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+class DeviceWatcher:
+    def __init__(
+        self,
+        poll_interval: float = 2.0,
+        debounce: float = 0.5,
+        use_uevents: bool = True,
+        enumerate=enumerate_devices,
+        rescan_interval: float = 60.0,
+    ):
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.debounce = debounce
+        self.enumerate = enumerate
+        self.uevents = _open_uevent_socket() if use_uevents else None
+        self.known = {}  # key -> device dict
+        self._stopped = False
+
+    def _drain_uevents(self) -> bool:
+        # True if any pending uevent is about a G600
+        relevant = False
+        while True:
+            try:
+                message = self.uevents.recv(8192)
+            except BlockingIOError:
+                return relevant
+            if any(m in message.upper() for m in UEVENT_MATCHES):
+                relevant = True
+
+    def _wait(self, timeout: float) -> bool:
+        # sleep until a G600 uevent or timeout, True if woken by an event
+        if self.uevents is None:
+            time.sleep(timeout)
+            return False
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.uevents], [], [], remaining)
+            if ready and self._drain_uevents():
+                return True
+
+    def _settle(self) -> None:
+        # wait until debounce seconds pass without another G600 uevent
+        if self.uevents is None:
+            time.sleep(self.debounce)
+            return
+        while self._wait(self.debounce):
+            pass
+
+    def scan(self) -> list[HotplugEvent]:
+        # compare hid.enumerate() with the devices seen last time
+        current = {_device_key(d): d for d in self.enumerate()}
+        events = [
+            HotplugEvent("remove", key, d) for key, d in self.known.items() if key not in current
+        ]
+        events += [
+            HotplugEvent("add", key, d) for key, d in current.items() if key not in self.known
+        ]
+        self.known = current
+        return events
+
+    def events(self, initial: bool = True):
+        # yields HotplugEvents until stop(). With initial the devices already
+        # attached are reported as "add" first.
+        if initial:
+            yield from self.scan()
+        else:
+            self.scan()
+        while not self._stopped:
+            # with uevents the timeout is only a safety net for missed events
+            self._wait(self.poll_interval if self.uevents is None else self.rescan_interval)
+            if self._stopped:
+                break
+            keys = {_device_key(d) for d in self.enumerate()}
+            if keys == self.known.keys():
+                continue
+            self._settle()
+            yield from self.scan()
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def close(self) -> None:
+        self.stop()
+        if self.uevents is not None:
+            self.uevents.close()
+            self.uevents = None
+
+
+def watch_and_apply(
+    profiles,
+    activate: int | None = None,
+    watcher: DeviceWatcher | None = None,
+    open_transport=None,
+    metrics=None,
+    retry: RetryPolicy = DEFAULT_RETRY,
+) -> None:
+    # Apply profiles to every G600 that shows up, now and whenever one is plugged
+    # in. apply_profiles compares with the onboard reports first, so a device that
+    # already holds the profiles gets no writes.
+    reports = {p.profile_number: bytes(p.feature_report()) for p in profiles}
+    watcher = watcher or DeviceWatcher()
+    try:
+        for event in watcher.events():
+            print("%s %s" % (event.action, event.key))
+            if event.action != "add":
+                continue
+            try:
+                with G600Session(
+                    path=event.device["path"],
+                    verbose=False,
+                    transport=open_transport(event.device) if open_transport else None,
+                    metrics=metrics,
+                    retry=retry,
+                ) as session:
+                    result = apply_profiles(session, reports, activate=activate)
+            except (OSError, ValueError) as e:
+                print("%s: %s" % (event.key, e))
+                continue
+            print(
+                "%s: written %s unchanged %s"
+                % (event.key, result.written or "-", result.unchanged or "-")
+            )
+    finally:
+        watcher.close()
@@ -0,0 +1,166 @@
+import asyncio
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+
+# Input reports of the G600 mouse interface, 8 bytes:
+#
+#   bytes 0-1  buttons bitmask (bit 0 = button 1 / left click, ...)
+#   bytes 2-3  X motion, signed
+#   bytes 4-5  Y motion, signed
+#   byte  6    vertical wheel, signed
+#   byte  7    horizontal wheel (tilt), signed
+#
+# Reports of any other length (e.g. the keyboard interface when G-keys send keys)
+# are passed through with only the raw bytes set.
+
+INPUT_REPORT_LENGTH: int = 8
+MOUSE_REPORT = struct.Struct("<Hhhbb")
+
+
+@dataclass(frozen=True, slots=True)
+class InputEvent:
+    timestamp: float  # time.monotonic() when the report was read
+    raw: bytes
+    buttons: int = 0
+    x: int = 0
+    y: int = 0
+    wheel: int = 0
+    pan: int = 0
+
+    def is_pressed(self, button: int) -> bool:
+        # button numbers start at 1 like BUTTON_1 in LogitechG600Profile
+        return bool(self.buttons & (1 << (button - 1)))
+
+
+def decode_input_report(data, timestamp: float) -> InputEvent:
+    raw = bytes(data)
+    if len(raw) != MOUSE_REPORT.size:
+        return InputEvent(timestamp, raw)
+    buttons, x, y, wheel, pan = MOUSE_REPORT.unpack(raw)
+    return InputEvent(timestamp, raw, buttons, x, y, wheel, pan)
+
+
+class Subscription:
+    # Events for one consumer. The buffer is a ring: when the consumer falls behind
+    # the oldest events are dropped (and counted) so the reader is never blocked.
+
+    def __init__(self, stream: "InputStream", maxlen: int):
+        self._stream = stream
+        self._events = deque(maxlen=maxlen)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def _publish(self, events: list) -> None:
+        free = self._events.maxlen - len(self._events)
+        if len(events) > free:
+            self.dropped += len(events) - free
+        self._events.extend(events)
+        self._ready.set()
+
+    def _close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def get_batch(self) -> list:
+        # every buffered event, waits for at least one; [] once the stream stopped
+        while not self._events:
+            if self.closed:
+                return []
+            self._ready.clear()
+            await self._ready.wait()
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    def unsubscribe(self) -> None:
+        self._stream.unsubscribe(self)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            batch = await self.get_batch()
+            if not batch:
+                return
+            for event in batch:
+                yield event
+
+
+class InputStream:
+    # Reads input reports from an open G600Session and fans decoded events out to
+    # any number of subscribers.
+    #
+    # The blocking hidapi read runs in a worker thread. It waits up to
+    # read_timeout_ms for the first report and then drains whatever else is queued
+    # without waiting (non-blocking reads), up to batch_size reports per batch, so
+    # at 1000 Hz the event loop is woken once per batch, not once per report.
+    #
+    #   stream = InputStream(session)
+    #   events = stream.subscribe()
+    #   task = asyncio.create_task(stream.run())
+    #   async for event in events:
+    #       ...
+
+    def __init__(
+        self,
+        session,
+        report_length: int = INPUT_REPORT_LENGTH,
+        batch_size: int = 64,
+        read_timeout_ms: int = 10,
+        subscriber_buffer: int = 4096,
+    ):
+        self.session = session
+        self.report_length = report_length
+        self.batch_size = batch_size
+        self.read_timeout_ms = read_timeout_ms
+        self.subscriber_buffer = subscriber_buffer
+        self.reports_read = 0
+        self._subscribers = []
+        self._running = False
+
+    def subscribe(self, maxlen: int | None = None) -> Subscription:
+        subscription = Subscription(self, maxlen or self.subscriber_buffer)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+        subscription._close()
+
+    def _read_batch(self) -> list:
+        reports = []
+        try:
+            data = self.session.read_input_report(self.report_length, self.read_timeout_ms)
+            while data:
+                reports.append(decode_input_report(data, time.monotonic()))
+                if len(reports) >= self.batch_size:
+                    break
+                # 0 = only what is already queued, never blocks (Transport.read)
+                data = self.session.read_input_report(self.report_length, 0)
+        except EOFError:
+            # finite sources (e.g. a ReplayTransport) end the stream
+            self._running = False
+        return reports
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._running = True
+        try:
+            while self._running:
+                batch = await loop.run_in_executor(None, self._read_batch)
+                if batch:
+                    self.reports_read += len(batch)
+                    for subscription in self._subscribers:
+                        subscription._publish(batch)
+        finally:
+            self._running = False
+            for subscription in self._subscribers:
+                subscription._close()
+
+    def stop(self) -> None:
+        self._running = False
@@ -0,0 +1,235 @@
+from functools import cache
+
+# Button bindings as text and back.
+#
+# A binding is (code, modifier, key):
+#   code      0x00 for a keyboard key, otherwise a mouse function (BUTTON_CODES)
+#   modifier  G600 modifier bitmask (MODIFIERS), not the HID 0xE0-0xE7 usages
+#   key       usage from HID 1.5 / Chapter 10 Keyboard/Keypad page 0x07
+#
+# Text form is a chord "MOD+MOD+KEY", case insensitive, e.g. "CMD+SHIFT+V",
+# "HYPER+5", "CTRL+RIGHT", "KEY_A", "BUTTON_4". parse_binding() accepts any chord,
+# binding_name() gives the canonical name of a binding with two table lookups.
+
+BUTTON_CODES: dict = {
+    "BUTTON_1": 0x01,
+    "BUTTON_2": 0x02,
+    "BUTTON_3": 0x03,
+    "BUTTON_4": 0x04,
+    "BUTTON_5": 0x05,
+    "RESOLUTION_UP": 0x11,
+    "RESOLUTION_DOWN": 0x12,
+    "RESOLUTION_CYCLE_UP": 0x13,
+    "PROFILE_CYCLE_UP": 0x14,
+    "RESOLUTION_ALTERNATE": 0x15,
+    "RESOLUTION_DEFAULT": 0x16,
+    "SECOND_MODE": 0x17,
+}
+
+LEFT_CTRL: int = 0x01
+LEFT_SHIFT: int = 0x02
+LEFT_ALT: int = 0x04
+LEFT_GUI: int = 0x08
+RIGHT_CTRL: int = 0x10
+RIGHT_SHIFT: int = 0x20
+RIGHT_ALT: int = 0x40
+RIGHT_GUI: int = 0x80
+MEH: int = LEFT_CTRL | LEFT_SHIFT | LEFT_ALT
+HYPER: int = MEH | LEFT_GUI
+
+MODIFIERS: dict = {
+    "CTRL": LEFT_CTRL,
+    "CONTROL": LEFT_CTRL,
+    "SHIFT": LEFT_SHIFT,
+    "ALT": LEFT_ALT,
+    "OPT": LEFT_ALT,
+    "OPTION": LEFT_ALT,
+    "CMD": LEFT_GUI,
+    "GUI": LEFT_GUI,
+    "META": LEFT_GUI,
+    "WIN": LEFT_GUI,
+    "SUPER": LEFT_GUI,
+    "MEH": MEH,
+    "HYPER": HYPER,
+}
+for _name, _bit in list(MODIFIERS.items()):
+    if _bit in (LEFT_CTRL, LEFT_SHIFT, LEFT_ALT, LEFT_GUI):
+        MODIFIERS["LEFT_" + _name] = _bit
+        MODIFIERS["RIGHT_" + _name] = _bit << 4
+
+# Keyboard/Keypad page 0x07, 0x04-0xA4. The modifier keys (0xE0-0xE7) are sent
+# through the modifier byte and the keypad extensions (0xB0-0xDD) are not listed.
+KEY_NAMES: dict = {0x04 + i: chr(ord("A") + i) for i in range(26)}
+KEY_NAMES.update({0x1E + i: str((i + 1) % 10) for i in range(10)})
+KEY_NAMES.update(
+    {
+        0x28: "RETURN",
+        0x29: "ESCAPE",
+        0x2A: "BACKSPACE",
+        0x2B: "TAB",
+        0x2C: "SPACE",
+        0x2D: "MINUS",
+        0x2E: "EQUAL",
+        0x2F: "LEFTBRACKET",
+        0x30: "RIGHTBRACKET",
+        0x31: "BACKSLASH",
+        0x32: "NON_US_HASH",
+        0x33: "SEMICOLON",
+        0x34: "QUOTE",
+        0x35: "GRAVE",
+        0x36: "COMMA",
+        0x37: "PERIOD",
+        0x38: "SLASH",
+        0x39: "CAPS_LOCK",
+        0x46: "PRINT_SCREEN",
+        0x47: "SCROLL_LOCK",
+        0x48: "PAUSE",
+        0x49: "INSERT",
+        0x4A: "HOME",
+        0x4B: "PAGE_UP",
+        0x4C: "DELETE",
+        0x4D: "END",
+        0x4E: "PAGE_DOWN",
+        0x4F: "RIGHT",
+        0x50: "LEFT",
+        0x51: "DOWN",
+        0x52: "UP",
+        0x53: "NUM_LOCK",
+        0x54: "KP_SLASH",
+        0x55: "KP_ASTERISK",
+        0x56: "KP_MINUS",
+        0x57: "KP_PLUS",
+        0x58: "KP_ENTER",
+        0x62: "KP_0",
+        0x63: "KP_PERIOD",
+        0x64: "NON_US_BACKSLASH",
+        0x65: "APPLICATION",
+        0x66: "POWER",
+        0x67: "KP_EQUAL",
+        0x74: "EXECUTE",
+        0x75: "HELP",
+        0x76: "MENU",
+        0x77: "SELECT",
+        0x78: "STOP",
+        0x79: "AGAIN",
+        0x7A: "UNDO",
+        0x7B: "CUT",
+        0x7C: "COPY",
+        0x7D: "PASTE",
+        0x7E: "FIND",
+        0x7F: "MUTE",
+        0x80: "VOLUME_UP",
+        0x81: "VOLUME_DOWN",
+        0x82: "LOCKING_CAPS_LOCK",
+        0x83: "LOCKING_NUM_LOCK",
+        0x84: "LOCKING_SCROLL_LOCK",
+        0x85: "KP_COMMA",
+        0x86: "KP_EQUAL_SIGN",
+        0x99: "ALTERNATE_ERASE",
+        0x9A: "SYSREQ",
+        0x9B: "CANCEL",
+        0x9C: "CLEAR",
+        0x9D: "PRIOR",
+        0x9E: "RETURN_2",
+        0x9F: "SEPARATOR",
+        0xA0: "OUT",
+        0xA1: "OPER",
+        0xA2: "CLEAR_AGAIN",
+        0xA3: "CRSEL",
+        0xA4: "EXSEL",
+    }
+)
+KEY_NAMES.update({0x3A + i: "F%d" % (i + 1) for i in range(12)})
+KEY_NAMES.update({0x68 + i: "F%d" % (i + 13) for i in range(12)})
+KEY_NAMES.update({0x59 + i: "KP_%d" % (i + 1) for i in range(9)})
+KEY_NAMES.update({0x87 + i: "INTERNATIONAL%d" % (i + 1) for i in range(9)})
+KEY_NAMES.update({0x90 + i: "LANG%d" % (i + 1) for i in range(9)})
+KEY_NAMES = dict(sorted(KEY_NAMES.items()))
+
+KEY_USAGES: dict = {name: usage for usage, name in KEY_NAMES.items()}
+KEY_USAGES.update(
+    {
+        "ENTER": 0x28,
+        "ESC": 0x29,
+        "-": 0x2D,
+        "=": 0x2E,
+        "[": 0x2F,
+        "]": 0x30,
+        "\\": 0x31,
+        ";": 0x33,
+        "'": 0x34,
+        "`": 0x35,
+        ",": 0x36,
+        ".": 0x37,
+        "/": 0x38,
+        "DEL": 0x4C,
+        "PGUP": 0x4B,
+        "PGDN": 0x4E,
+        "RIGHT_ARROW": 0x4F,
+        "LEFT_ARROW": 0x50,
+        "DOWN_ARROW": 0x51,
+        "UP_ARROW": 0x52,
+    }
+)
+
+
+def _modifier_prefix(modifier: int) -> str:
+    # canonical order: HYPER or MEH if they fit, then CTRL CMD SHIFT ALT, left first
+    parts = []
+    if modifier & HYPER == HYPER:
+        parts.append("HYPER")
+        modifier &= ~HYPER
+    elif modifier & MEH == MEH:
+        parts.append("MEH")
+        modifier &= ~MEH
+    for side, shift in (("", 0), ("RIGHT_", 4)):
+        for name, bit in (("CTRL", LEFT_CTRL), ("CMD", LEFT_GUI), ("SHIFT", LEFT_SHIFT), ("ALT", LEFT_ALT)):
+            if modifier & (bit << shift):
+                parts.append(side + name)
+    return "+".join(parts)
+
+
+# every modifier byte -> "CTRL+SHIFT" style prefix, so naming a binding never loops
+MODIFIER_PREFIXES: tuple = tuple(_modifier_prefix(m) for m in range(256))
+CODE_NAMES: dict = {code: name for name, code in BUTTON_CODES.items()}
+
+
+def binding_name(code: int, modifier: int, key: int) -> str | None:
+    # canonical name, parse_binding(binding_name(*b)) == b; None if not nameable
+    if code:
+        if modifier or key:
+            return None
+        return CODE_NAMES.get(code)
+    prefix = MODIFIER_PREFIXES[modifier]
+    if not key:
+        return prefix or "NONE"
+    key_name = KEY_NAMES.get(key)
+    if key_name is None:
+        return None
+    if not prefix:
+        return "KEY_" + key_name
+    return prefix + "+" + key_name
+
+
+@cache
+def parse_binding(text: str) -> tuple[int, int, int]:
+    # "CMD+SHIFT+V" -> (0x00, 0x0A, 0x19). Raises ValueError for unknown names.
+    name = text.strip().upper()
+    if name in BUTTON_CODES:
+        return (BUTTON_CODES[name], 0x00, 0x00)
+    if name == "NONE":
+        return (0x00, 0x00, 0x00)
+    *modifier_names, key_name = name.split("+")
+    modifier = 0
+    for part in modifier_names:
+        if part not in MODIFIERS:
+            raise ValueError("Unknown modifier %s in %s" % (part, text))
+        modifier |= MODIFIERS[part]
+    if key_name.startswith("KEY_") and key_name[4:] in KEY_USAGES:
+        key_name = key_name[4:]
+    if key_name in KEY_USAGES:
+        return (0x00, modifier, KEY_USAGES[key_name])
+    if key_name in MODIFIERS:
+        # modifiers only, e.g. "CTRL+SHIFT"
+        return (0x00, modifier | MODIFIERS[key_name], 0x00)
+    raise ValueError("Unknown key %s in %s" % (key_name, text))
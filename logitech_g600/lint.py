@@ -0,0 +1,156 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from logitech_g600 import codec, keys
+from logitech_g600.profile_file import ProfileBuilder, profile_from_dict
+from logitech_g600.report import iter_report_file
+
+# Checks for profile files and report dumps, beyond what the profile setters enforce:
+#
+#   errors    unknown report id, frequency byte, DPI out of 200-8200 (0 is a
+#             disabled slot/shift), every DPI slot disabled, DPI default index out
+#             of 0-3, unknown button code, unknown key usage
+#   warnings  modifier/key set on a mouse function, the same binding on two
+#             buttons (in either layer), no SECOND_MODE button (G-shift unreachable)
+#
+# lint_paths() expands directories and spreads the files over a process pool, in
+# chunks so that each worker resolves a shared base profile only once.
+#
+#   for problem in lint_paths(["profiles/"]):
+#       print(problem)
+
+PROFILE_FILE_SUFFIXES: tuple = (".toml", ".json")
+DUMP_FILE_SUFFIXES: tuple = (".bin", ".txt", ".dump")
+CHUNK_SIZE: int = 64
+
+SECOND_MODE: int = keys.BUTTON_CODES["SECOND_MODE"]
+DPI_BYTES: range = range(200 // 50, 8200 // 50 + 1)
+
+
+class Problem(NamedTuple):
+    location: str  # file, or file[n] for the nth report of a dump
+    severity: str  # "error" or "warning"
+    message: str
+
+    def __str__(self) -> str:
+        return "%s: %s: %s" % (self.location, self.severity, self.message)
+
+
+def _binding_problems(layer: str, index: int, binding: tuple) -> list[tuple[str, str]]:
+    code, modifier, key = binding
+    where = "%sG%d" % (layer, index + 1)
+    if code:
+        if code not in keys.CODE_NAMES:
+            return [("error", "%s unknown button code 0x%02X" % (where, code))]
+        if modifier or key:
+            return [("warning", "%s modifier/key ignored on %s" % (where, keys.CODE_NAMES[code]))]
+        return []
+    if key and key not in keys.KEY_NAMES:
+        return [("error", "%s unknown key usage 0x%02X" % (where, key))]
+    return []
+
+
+def lint_report(data) -> list[tuple[str, str]]:
+    # (severity, message) for one 154 byte profile report
+    data = bytes(data)
+    if len(data) != codec.REPORT_LENGTH:
+        return [("error", "invalid report length %d" % len(data))]
+    r = codec.decode_report(data)
+    problems = []
+    if r.report_id not in (0xF3, 0xF4, 0xF5):
+        problems.append(("error", "invalid report id 0x%02X" % r.report_id))
+    if r.frequency_byte not in codec.BYTE_TO_FREQUENCY:
+        problems.append(("error", "invalid frequency byte 0x%02X" % r.frequency_byte))
+    # 0 disables the DPI shift or a DPI slot, the device dumps have them
+    if r.dpi_shift and r.dpi_shift not in DPI_BYTES:
+        problems.append(("error", "DPI shift %d out of 200-8200" % (r.dpi_shift * 50)))
+    for i, dpi in enumerate(r.dpis):
+        if dpi and dpi not in DPI_BYTES:
+            problems.append(("error", "DPI%d %d out of 200-8200" % (i + 1, dpi * 50)))
+    if not any(r.dpis):
+        problems.append(("error", "every DPI slot is disabled"))
+    if r.dpi_default not in range(len(r.dpis)):
+        problems.append(("error", "DPI default index %d out of 0-3" % r.dpi_default))
+
+    seen = {}  # binding -> first (layer, index) it is on
+    for layer, buttons in (("", r.buttons), ("G-shift ", r.gshift_buttons)):
+        for index, binding in enumerate(buttons):
+            problems += _binding_problems(layer, index, binding)
+            if binding == (0, 0, 0):
+                continue
+            if binding in seen:
+                first_layer, first_index = seen[binding]
+                # the same button keeping its binding in both layers is normal
+                if first_index != index:
+                    problems.append(
+                        (
+                            "warning",
+                            "%s on %sG%d and %sG%d"
+                            % (
+                                keys.binding_name(*binding) or str(binding),
+                                first_layer,
+                                first_index + 1,
+                                layer,
+                                index + 1,
+                            ),
+                        )
+                    )
+            else:
+                seen[binding] = (layer, index)
+    if all(code != SECOND_MODE for code, _, _ in r.buttons):
+        problems.append(("warning", "no SECOND_MODE button, the G-shift layer is unreachable"))
+    return problems
+
+
+def lint_file(path: str, builder: ProfileBuilder | None = None) -> list[Problem]:
+    if Path(path).suffix in PROFILE_FILE_SUFFIXES:
+        builder = builder or ProfileBuilder()
+        try:
+            # always parsed, the compile cache could hide errors of the setters
+            data, _ = builder.resolve(path)
+            report = profile_from_dict(data).feature_report()
+        except (ValueError, KeyError, OSError) as e:
+            return [Problem(path, "error", str(e))]
+        return [Problem(path, s, m) for s, m in lint_report(report)]
+    problems = []
+    try:
+        for n, report in enumerate(iter_report_file(path)):
+            location = "%s[%d]" % (path, n)
+            problems += [Problem(location, s, m) for s, m in lint_report(report)]
+    except (ValueError, OSError) as e:
+        problems.append(Problem(path, "error", str(e)))
+    return problems
+
+
+def _lint_chunk(paths: list[str]) -> list[list[Problem]]:
+    builder = ProfileBuilder()
+    return [lint_file(path, builder) for path in paths]
+
+
+def expand_paths(paths) -> list[str]:
+    # directories are searched recursively for profile files and dumps
+    files = []
+    suffixes = PROFILE_FILE_SUFFIXES + DUMP_FILE_SUFFIXES
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                str(p) for p in Path(path).rglob("*") if p.suffix in suffixes and p.is_file()
+            )
+        else:
+            files.append(str(path))
+    return files
+
+
+def lint_paths(paths, jobs: int | None = None) -> dict[str, list[Problem]]:
+    # {file: problems}, in the order of the expanded paths. jobs=1 lints in this
+    # process, otherwise a pool of jobs (default cpu count) processes
+    files = expand_paths(paths)
+    chunks = [files[i : i + CHUNK_SIZE] for i in range(0, len(files), CHUNK_SIZE)]
+    if jobs == 1 or len(chunks) <= 1:
+        results = map(_lint_chunk, chunks)
+        return dict(zip(files, (p for chunk in results for p in chunk)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(_lint_chunk, chunks)
+        return dict(zip(files, (p for chunk in results for p in chunk)))
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+
+# Latency histograms per (device serial, operation), filled by G600Session when it
+# is given a LatencyMetrics:
+#
+#   metrics = LatencyMetrics()
+#   with G600Session(metrics=metrics) as session:
+#       ...
+#   metrics.write_prometheus("/var/lib/node_exporter/g600.prom")
+#
+# Operations: open, ready_wait, get_feature_report, send_feature_report, read_input
+
+# upper bounds in seconds, the last bucket (+Inf) is implicit
+DEFAULT_BUCKETS: tuple = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        # upper bound of the bucket holding the q-th observation (inf if above all)
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_s": self.sum,
+            "max_s": self.max,
+            "p50_s": self.quantile(0.5),
+            "p99_s": self.quantile(0.99),
+            "buckets": {
+                ("%g" % bound): n
+                for bound, n in zip(self.buckets + (float("inf"),), self.counts)
+            },
+        }
+
+
+class LatencyMetrics:
+    # thread safe, one instance can be shared by every session of a fleet run
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, serial_number: str | None, operation: str, seconds: float, error: bool = False
+    ) -> None:
+        key = (serial_number or "unknown", operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds, error)
+
+    def histogram(self, serial_number: str, operation: str) -> LatencyHistogram | None:
+        return self._histograms.get((serial_number, operation))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            d = {}
+            for (serial_number, operation), histogram in sorted(self._histograms.items()):
+                d.setdefault(serial_number, {})[operation] = histogram.to_dict()
+            return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=1)
+
+    def to_prometheus(self) -> str:
+        name = "g600_hid_operation_seconds"
+        lines = [
+            "# HELP %s Latency of HID operations on Logitech G600 devices." % name,
+            "# TYPE %s histogram" % name,
+        ]
+        errors = []
+        with self._lock:
+            for (serial_number, operation), h in sorted(self._histograms.items()):
+                labels = 'serial="%s",operation="%s"' % (
+                    serial_number.replace("\\", "\\\\").replace('"', '\\"'),
+                    operation,
+                )
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append('%s_bucket{%s,le="%g"} %d' % (name, labels, bound, cumulative))
+                lines.append('%s_bucket{%s,le="+Inf"} %d' % (name, labels, h.count))
+                lines.append("%s_sum{%s} %.9f" % (name, labels, h.sum))
+                lines.append("%s_count{%s} %d" % (name, labels, h.count))
+                errors.append("g600_hid_operation_errors_total{%s} %d" % (labels, h.errors))
+        lines.append("# HELP g600_hid_operation_errors_total Failed HID operations.")
+        lines.append("# TYPE g600_hid_operation_errors_total counter")
+        lines.extend(errors)
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        _write_atomic(path, self.to_json())
+
+    def write_prometheus(self, path: str) -> None:
+        # node_exporter's textfile collector must never see a half written file
+        _write_atomic(path, self.to_prometheus())
+
+
+def _write_atomic(path: str, content: str) -> None:
+    tmp = "%s.tmp%d" % (path, os.getpid())
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, path)
@@ -0,0 +1,656 @@
+from logitech_g600 import codec, keys
+from logitech_g600.device import G600Session, device_serial_number
+from logitech_g600.errors import WriteError
+from logitech_g600.report_cache import WrittenReportCache
+
+
+class LogitechG600Profile:
+    LED_EFFECT_SOLID: int = (
+        0x00  # https://github.com/libratbag/libratbag/blob/8444ceb638b19c3fbeb073a5cd29f17c6d34dd07/src/driver-logitech-g600.c#L51-L53
+    )
+    LED_EFFECT_BREATHE: int = 0x01
+    LED_EFFECT_LED_CYCLE: int = 0x02
+
+    # Modifiers. From HID 1.5 / Chapter 10. Keyboard/keypad page 0x07  
+    # E0 Keyboard LeftControl
+    # E1 Keyboard LeftShift
+    # E2 Keyboard LeftAlt
+    # E3 Keyboard Left GUI 
+    # E4 Keyboard RightControl
+    # E5 Keyboard LeftShift
+    # E6 Keyboard LeftAlt
+    # E7 Keyboard Left GUI 
+        
+    LEFT_CTRL: int = 0x01 # This values are not from HID 1.5, it's a G600 thing
+    LEFT_SHIFT: int = 0x02
+    LEFT_ALT: int = 0x04
+    LEFT_META: int = 0x08 # 
+    LEFT_GUI: int = 0x08 # LEFT_META, LEFT_GUI and LEFT_CMD are the same key
+    LEFT_CMD: int = 0x08
+    RIGHT_CTRL: int = 0x10
+    RIGHT_SHIFT: int = 0x20
+    RIGHT_ALT: int = 0x40
+    RIGHT_META: int = 0x80
+    RIGHT_GUI: int = 0x80
+    RIGHT_CMD: int = 0x80
+
+    HYPER = LEFT_CTRL | LEFT_SHIFT | LEFT_ALT | LEFT_GUI
+    MEH = LEFT_CTRL | LEFT_SHIFT | LEFT_ALT
+
+    # Named bindings. set_button accepts these and any other "MOD+MOD+KEY" chord,
+    # see keys.parse_binding
+    NAME_TO_CODE_MODIFIER_KEY = {
+        "BUTTON_1": (0x01, 0x00, 0x00),
+        "BUTTON_2": (0x02, 0x00, 0x00),
+        "BUTTON_3": (0x03, 0x00, 0x00),
+        "BUTTON_4": (0x04, 0x00, 0x00),
+        "BUTTON_5": (0x05, 0x00, 0x00),
+        "RESOLUTION_UP": (0x11, 0x00, 0x00),
+        "RESOLUTION_DOWN": (0x12, 0x00, 0x00),
+        "RESOLUTION_CYCLE_UP": (0x13, 0x00, 0x00),
+        "PROFILE_CYCLE_UP": (0x14, 0x00, 0x00),
+        "RESOLUTION_ALTERNATE": (0x15, 0x00, 0x00),
+        "RESOLUTION_DEFAULT": (0x16, 0x00, 0x00),
+        "SECOND_MODE": (0x17, 0x00, 0x00),
+        "KEY_1": (
+            0x00,
+            0x00,
+            0x1E,
+        ),  # From HID Usage Table for USB / https://usb.org/document-library/hid-usage-tables-15
+
+        "HYPER+1": (0x00, HYPER, 0x1E), # From HID usage table for USB, Chapter 10 Keyboard/Keypad page 0x07
+        "MEH+1": (0x00, MEH, 0x1E), # From HID 1.5 / Chapter 10 Keyboard/Keypat page 0x07 / Keyboard 1 and !
+        "KEY_2": (0x00, 0x00, 0x1F),
+        "HYPER+2": (0x00, HYPER, 0x1F),
+        "MEH+2": (0x00, MEH, 0x1F),
+        "KEY_3": (0x00, 0x00, 0x20),
+        "HYPER+3": (0x00, HYPER, 0x20),
+        "MEH+3": (0x00, MEH, 0x20),
+        "KEY_4": (0x00, 0x00, 0x21),
+        "HYPER+4": (0x00, HYPER, 0x21),
+        "MEH+4": (0x00, MEH, 0x21),
+        "KEY_5": (0x00, 0x00, 0x22),
+        "HYPER+5": (0x00, HYPER, 0x22),
+        "MEH+5": (0x00, MEH, 0x22),
+        "KEY_6": (0x00, 0x00, 0x23),
+        "HYPER+6": (0x00, HYPER, 0x23),
+        "MEH+6": (0x00, MEH, 0x23),
+        "KEY_7": (0x00, 0x00, 0x24),
+        "HYPER+7": (0x00, HYPER, 0x24),
+        "MEH+7": (0x00, MEH, 0x24),
+        "KEY_8": (0x00, 0x00, 0x25),
+        "HYPER+8": (0x00, HYPER, 0x25),
+        "MEH+8": (0x00, MEH, 0x25),
+        "KEY_9": (0x00, 0x00, 0x26),
+        "HYPER+9": (0x00, HYPER, 0x26),
+        "MEH+9": (0x00, MEH, 0x26),
+        "KEY_0": (0x00, 0x00, 0x27), # From HID 1.5 / Chapter 10 Keyboard/Keypad page 0x07 / Keyboard 0 and )
+        "HYPER+0": (0x00, HYPER, 0x27),
+        "MEH+0": (0x00, MEH, 0x27), # 0x27
+        "KEY_MINUS": (0x00, 0x00, 0x2D),
+        "HYPER+MINUS": (0x00, HYPER, 0x2D),
+        "MEH+MINUS": (0x00, MEH, 0x2D),
+        "KEY_EQUAL": (0x00, 0x00, 0x2E),
+        "HYPER+EQUAL": (0x00, HYPER, 0x2E),
+        "MEH+EQUAL": (0x00, MEH, 0x2E),
+        "KEY_MUTE": (0x00, 0x00, 0x7F),
+        "KEY_VOLUME_UP": (0x00, 0x00, 0x80),
+        "KEY_VOLUME_DOWN": (0x00, 0x00, 0x81),
+        # There is no Media Play/Pause key in the HID Usage Table for USB  / Keyboard/Keypad Page (0x07)
+        # The Play/Pause (0xCD) and Play/Skip (0xCE) are part of Consumer Page 0x0C
+        "KEY_A": (0x00, 0x00, 0x04),
+        "KEY_B": (0x00, 0x00, 0x05),
+        "SHIFT+B": (0x00, LEFT_SHIFT, 0x05),
+        "CMD+B": (0x00, LEFT_CMD, 0x05),
+        "KEY_C": (0x00, 0x00, 0x06),
+        "SHIFT+C": (0x00, LEFT_SHIFT, 0x06),
+        "CMD+C": (0x00, LEFT_CMD, 0x06),
+        "KEY_V": (0x00, 0x00, 0x19),
+        "CMD+V": (0x00, LEFT_CMD, 0x19),
+        "CMD+SHIFT+V": (0x00, LEFT_CMD | LEFT_SHIFT, 0x19),
+        "CTRL+RIGHT": (0x00, LEFT_CTRL, 0x4F), # in HID UsageTable for USB / 4f -> Keyboard RightArrow 
+        "CTRL+LEFT": (0x00, LEFT_CTRL, 0x50), # in HID UsageTable for USB / 50 -> Keyboard LeftArrow 
+        "CTRL+CMD+SHIFT+4": (0x00, LEFT_CTRL|LEFT_CMD|LEFT_SHIFT, 0x21), # in HIG UsageTable for USB / 0x21 -> "4"
+        "CMD+`": (0x00, LEFT_CMD, 0x35 ), # in HID Usage Table for USB / 35 -> Keyboard Grave Accent and Tilde
+    }
+    BUTTON_ORDER = {
+        "G1": 0,
+        "LEFT_CLICK": 0,
+        "G2": 1,
+        "RIGHT_CLICK": 1,
+        "G3": 2,
+        "WHEEL_CLICK": 2,
+        "G4": 3,
+        "WHEEL_LEFT": 3,
+        "G5": 4,
+        "WHEEL_RIGHT": 4,
+        "G6": 5,
+        "G7": 6,
+        "G8": 7,
+        "G9": 8,
+        "G10": 9,
+        "G11": 10,
+        "G12": 11,
+        "G13": 12,
+        "G14": 13,
+        "G15": 14,
+        "G16": 15,
+        "G17": 16,
+        "G18": 17,
+        "G19": 18,
+        "G20": 19,
+    }
+
+    # All state lives in one 154 byte report buffer, every property reads and writes
+    # it in place (offsets in codec.py). New profiles are a copy of DEFAULT_REPORT.
+    __slots__ = ("_report",)
+
+    def __init__(self, profile_number: int):
+        report_id = 0xF3 + (profile_number)
+        if report_id not in [0xF3, 0xF4, 0xF5]:
+            raise ValueError("Invalid profile number")
+        self._report = bytearray(DEFAULT_REPORT)
+        self._report[0] = report_id
+
+    def _install_defaults(self) -> None:
+        # only run once, to build DEFAULT_REPORT
+        self._report = bytearray(codec.REPORT_LENGTH)
+        self._report[0] = 0xF3
+        self.color = (0, 0, 0)
+        self.gshift_color = (0, 0, 0)
+        self.led_effect = LogitechG600Profile.LED_EFFECT_SOLID
+        self.led_duration = 0
+        self.frequency = 125
+        self._report[12] = 0x04  # dpi shift 200
+        self._report[14:18] = bytes([3200 // 50, 2000 // 50, 1200 // 50, 400 // 50])
+        self._report[13] = 2  # 1200 dpi
+        self._report[6:11] = codec.UNKNOWN1
+        self._report[18:31] = codec.UNKNOWN2
+        # buttons are (code, modifier, value)
+        # code can be 
+        # 0x00 regular keyboard key from HID Usage Table 0x07 Keyboard usage
+        # 0x01 button 1
+        # 0x02 button 2
+        # 0x03 button 3
+        # 0x04 button 4
+        # 0x05 button 5
+        # 0x11 DPI resolution up 
+        # 0x12 DPI resolution down
+        # 0x13 resolution cycle
+        # 0x14 profile cycle
+        # 0x15 resolution alternate
+        # 0x16 resolution default
+        # 0x17 second mode
+
+        for i in range(20):
+            self.set_button("G%d" % (i + 1), value=(0, 0, 0x1E))
+
+        # default mappings from https://www.logitech.com/assets/44964/3/g600-mmo-gaming-mouse-quickstart-guide.pdf
+        self.set_button("G1", "BUTTON_1")  # button1 - left click
+        self.set_button("G2", "BUTTON_2")  # button2 - right click
+
+        self.set_button("G3", "BUTTON_3")  # button3 - wheel click
+        self.set_button("G4", "BUTTON_4")  # button4 - wheel left
+        self.set_button("G5", "BUTTON_5")  # button5 - wheel right
+
+        self.set_button("G6", "SECOND_MODE")  # SECOND_MODE / G-Shift / 0x17
+
+        self.set_button("G7", value=(0, self.LEFT_SHIFT, 0x05))  # shift - B
+        self.set_button("G8", "PROFILE_CYCLE_UP")  # profile cycle up - 0x14
+
+        for i in range(9, 19):
+            self.set_button("G%d" % i, value=(0, 0, 0x1E + i - 9))
+
+        self.set_button("g19", "KEY_MINUS")
+        self.set_button("g20", "KEY_EQUAL")
+
+        self._report[codec.OFFSET_GSHIFT_BUTTONS :] = self._report[
+            codec.OFFSET_BUTTONS : codec.OFFSET_GSHIFT_COLOR
+        ]
+        # Copy the G9 to G20 buttons to the G-Shift buttons adding LEFT_CTRL modifier
+        self.derive_gshift_layer(self.LEFT_CTRL, ["G%d" % i for i in range(9, 21)])
+
+    @property
+    def profile_number(self) -> int:
+        return self._report[0] - 0xF3
+
+    @property
+    def report_id(self) -> int:
+        return self._report[0]
+
+    @property
+    def led_red(self) -> int:
+        return self._report[1]
+
+    @led_red.setter
+    def led_red(self, value: int) -> None:
+        self._report[1] = value
+
+    @property
+    def led_green(self) -> int:
+        return self._report[2]
+
+    @led_green.setter
+    def led_green(self, value: int) -> None:
+        self._report[2] = value
+
+    @property
+    def led_blue(self) -> int:
+        return self._report[3]
+
+    @led_blue.setter
+    def led_blue(self, value: int) -> None:
+        self._report[3] = value
+
+    @property
+    def led_effect(self) -> int:
+        return self._report[4]
+
+    @led_effect.setter
+    def led_effect(self, value: int) -> None:
+        self._report[4] = value
+
+    @property
+    def led_duration(self) -> int:
+        return self._report[5]
+
+    @led_duration.setter
+    def led_duration(self, value: int) -> None:
+        self._report[5] = value
+
+    def get_led_effect_string(self):
+        if self.led_effect == LogitechG600Profile.LED_EFFECT_BREATHE:
+            return "Breathing"
+        if self.led_effect == LogitechG600Profile.LED_EFFECT_LED_CYCLE:
+            return "LED Cycle"
+        if self.led_effect == LogitechG600Profile.LED_EFFECT_SOLID:
+            return "LED Solid"
+        else:
+            return "Unknown"
+
+    def feature_report(self) -> bytearray:
+        # the profile's own buffer, not a copy: take bytes() of it to keep a snapshot
+        return self._report
+
+    def copy(self) -> "LogitechG600Profile":
+        # a 154 byte copy, cheaper than tracking shared buffers for copy-on-write
+        profile = LogitechG600Profile.__new__(type(self))
+        profile._report = bytearray(self._report)
+        return profile
+
+    __copy__ = copy
+
+    @classmethod
+    def from_report(cls, report) -> "LogitechG600Profile":
+        # Build a profile from a 154 byte report (as returned by get_feature_report)
+        report = bytearray(report)
+        if len(report) != codec.REPORT_LENGTH:
+            raise ValueError("Invalid feature report length %d" % len(report))
+        if report[0] not in [0xF3, 0xF4, 0xF5]:
+            raise ValueError("Invalid report id 0x%02X" % report[0])
+        if report[11] not in codec.BYTE_TO_FREQUENCY:
+            raise ValueError("Invalid frequency byte 0x%02X" % report[11])
+        profile = cls.__new__(cls)  # skip the default template
+        profile._report = report
+        return profile
+
+    def frequency_to_byte(self):
+        if self._report[11] not in codec.BYTE_TO_FREQUENCY:
+            raise ValueError("Invalid frequency byte 0x%02X" % self._report[11])
+        return self._report[11]
+
+    @property
+    def frequency(self) -> int:
+        return codec.BYTE_TO_FREQUENCY.get(self._report[11])
+
+    @frequency.setter
+    def frequency(self, f: int) -> int:
+        if f not in [125, 250, 500, 1000]:
+            raise ValueError("Invalid frequency")
+        self._report[11] = codec.FREQUENCY_TO_BYTE[f]
+
+    @property
+    def dpi_shift(self) -> int:
+        return self._report[12] * 50
+
+    @dpi_shift.setter
+    def dpi_shift(self, d: int) -> None:
+        if d not in range(200, 8201, 50):
+            raise ValueError("Invalid DPI shift")
+        self._report[12] = d // 50
+
+    @property
+    def dpi_default(self) -> int:
+        return self._report[14 + self._report[13]] * 50
+
+    @dpi_default.setter
+    def dpi_default(self, d: int) -> None:
+        d = d // 50
+        dpis = self._report[14:18]
+        if d not in dpis:
+            raise ValueError(
+                "Invalid DPI default %d, not in %s"
+                % (d * 50, [x * 50 for x in dpis])
+            )
+        self._report[13] = dpis.index(d)
+
+    def _set_dpi(self, slot: int, d: int) -> None:
+        if d not in range(200, 8201, 50):
+            raise ValueError("Invalid DPI%d value %d" % (slot + 1, d))
+        self._report[14 + slot] = d // 50
+
+    @property
+    def dpi1(self) -> int:
+        return self._report[14] * 50
+
+    @dpi1.setter
+    def dpi1(self, d: int) -> None:
+        self._set_dpi(0, d)
+
+    @property
+    def dpi2(self) -> int:
+        return self._report[15] * 50
+
+    @dpi2.setter
+    def dpi2(self, d: int) -> None:
+        self._set_dpi(1, d)
+
+    @property
+    def dpi3(self) -> int:
+        return self._report[16] * 50
+
+    @dpi3.setter
+    def dpi3(self, d: int) -> None:
+        self._set_dpi(2, d)
+
+    @property
+    def dpi4(self) -> int:
+        return self._report[17] * 50
+
+    @dpi4.setter
+    def dpi4(self, d: int) -> None:
+        self._set_dpi(3, d)
+
+    @property
+    def left_click(self) -> tuple:
+        return self.get_button("LEFT_CLICK")
+
+    @left_click.setter
+    def left_click(self, value: str) -> None:
+        self.set_button("LEFT_CLICK", value)
+
+    def _button_offset(self, base: int, button_name: str) -> int:
+        index = self.BUTTON_ORDER.get(button_name.upper(), None)
+        if index is None:
+            raise ValueError("Invalid button name %s" % button_name)
+        return base + index * 3
+
+    def get_button(self, button_name: str) -> tuple:
+        offset = self._button_offset(codec.OFFSET_BUTTONS, button_name)
+        return tuple(self._report[offset : offset + 3])
+
+    def get_button_name(self, button_name: str) -> str | None:
+        # canonical name of the binding ("CMD+SHIFT+V"), None if it has none
+        return keys.binding_name(*self.get_button(button_name))
+
+    def set_button(self, button_name: str, value: tuple[int, int, int] | str) -> None:
+        # (code, modifier, key) or a name / chord like "CTRL+CMD+SHIFT+4"
+        if isinstance(value, str):
+            value = keys.parse_binding(value)
+        code, modifier, key = value
+        offset = self._button_offset(codec.OFFSET_BUTTONS, button_name)
+        self._report[offset : offset + 3] = bytes((code, modifier, key))
+
+    def get_gshift_button(self, button_name: str) -> tuple:
+        offset = self._button_offset(codec.OFFSET_GSHIFT_BUTTONS, button_name)
+        return tuple(self._report[offset : offset + 3])
+
+    def get_gshift_button_name(self, button_name: str) -> str | None:
+        return keys.binding_name(*self.get_gshift_button(button_name))
+
+    def set_gshift_button(
+        self, button_name: str, value: tuple[int, int, int] | str
+    ) -> None:
+        if isinstance(value, str):
+            value = keys.parse_binding(value)
+        code, modifier, key = value
+        offset = self._button_offset(codec.OFFSET_GSHIFT_BUTTONS, button_name)
+        self._report[offset : offset + 3] = bytes((code, modifier, key))
+
+    def derive_gshift_layer(self, modifier: int, button_names=None) -> None:
+        # G-shift binding = normal binding plus modifier, for button_names (default
+        # all 20). Mouse buttons and functions (code != 0) are copied unchanged.
+        for button_name in button_names or ["G%d" % (i + 1) for i in range(codec.BUTTON_COUNT)]:
+            code, mod, key = self.get_button(button_name)
+            if code == 0:
+                mod |= modifier
+            self.set_gshift_button(button_name, value=(code, mod, key))
+
+    @property
+    def gshift_color(self) -> tuple:
+        return tuple(self._report[codec.OFFSET_GSHIFT_COLOR : codec.OFFSET_GSHIFT_BUTTONS])
+
+    @gshift_color.setter
+    def gshift_color(self, color: tuple) -> None:
+        if len(color) != 3:
+            raise ValueError("Invalid color %s" % color)
+        for c in color:
+            if c not in range(256):
+                raise ValueError("Invalid value %s in color %s" % (c, color))
+        self._report[codec.OFFSET_GSHIFT_COLOR : codec.OFFSET_GSHIFT_BUTTONS] = bytes(color)
+
+    @property
+    def color(self) -> tuple:
+        return (self.led_red, self.led_green, self.led_blue)
+
+    @color.setter
+    def color(self, color: tuple) -> None:
+        if len(color) != 3:
+            raise ValueError("Invalid color %s" % color)
+        for c in color:
+            if c not in range(256):
+                raise ValueError("Invalid value %s in color %s" % (c, color))
+        self.led_red, self.led_green, self.led_blue = color
+
+    def write_to_device(
+        self,
+        session: G600Session | None = None,
+        skip_unchanged: bool = False,
+        cache: WrittenReportCache | None = None,
+    ) -> bool:
+        # skip_unchanged: read the onboard report first and only write if it differs
+        # cache: remember what was written per device serial, a repeat write of the
+        #        same report is skipped without opening the device
+        # returns True if the report was sent to the device
+        report = self.feature_report()
+        if session is None:
+            if cache is not None and cache.is_current(device_serial_number(), report):
+                print("Profile %d already written, skipping" % self.profile_number)
+                return False
+            with G600Session() as session:
+                return self.write_to_device(session, skip_unchanged, cache)
+
+        if cache is not None and cache.is_current(session.serial_number, report):
+            print("Profile %d already written, skipping" % self.profile_number)
+            return False
+        if skip_unchanged:
+            if bytes(session.read_profile_report(self.profile_number)) == report:
+                print("Profile %d unchanged on device, skipping" % self.profile_number)
+                if cache is not None:
+                    cache.remember(session.serial_number, report)
+                return False
+
+        print("writing profile", self.profile_number)
+        try:
+            rc = session.write_profile_report(report)
+        except WriteError:
+            print("Close Logitech GHUB, Karabiner, Hammerspoon, etc.\n run this as sudo root")
+            raise
+        print("Successfully wrote profile %d (%d bytes)" % (self.profile_number, rc))
+        if cache is not None:
+            cache.remember(session.serial_number, report)
+        return True
+
+    def set_as_active_profile(self, session: G600Session | None = None):
+        if session is None:
+            with G600Session() as session:
+                return self.set_as_active_profile(session)
+
+        print("Set profile %d as active profile" % self.profile_number)
+        session.set_active_profile(self.profile_number)
+
+    def __repr__(self):
+        return "LogitechG600Profile(%d)" % self.profile_number
+
+    def __str__(self):
+        to_return = []
+        to_return.append("Profile %d" % self.profile_number)
+        to_return.append(
+            "RGB (%d,%d,%d)" % (self.led_red, self.led_green, self.led_blue)
+        )
+        to_return.append("LED effect (%s)" % (self.get_led_effect_string()))
+        to_return.append("LED duration (%d seconds)" % (self.led_duration))
+        to_return.append(
+            "Frequency %s Hz (0x%02X)" % (self.frequency, self.frequency_to_byte())
+        )
+        to_return.append(
+            "DPI Shift %4d dpi (0x%02X)" % (self.dpi_shift, self._report[12])
+        )
+        to_return.append(
+            "DPI Default %4ddpi (0x%02X)" % (self.dpi_default, self._report[13])
+        )
+        to_return.append("DPI1 %4ddpi (0x%02X)" % (self.dpi1, self._report[14]))
+        to_return.append("DPI2 %4ddpi (0x%02X)" % (self.dpi2, self._report[15]))
+        to_return.append("DPI3 %4ddpi (0x%02X)" % (self.dpi3, self._report[16]))
+        to_return.append("DPI4 %4ddpi (0x%02X)" % (self.dpi4, self._report[17]))
+        to_return.append(
+            "Left Click    G1 0x%02X 0x%02X 0x%02X" % self.get_button("LEFT_CLICK")
+        )
+        to_return.append(
+            "Right Click   G2 0x%02X 0x%02X 0x%02X" % self.get_button("RIGHT_CLICK")
+        )
+        to_return.append(
+            "              G3 0x%02X 0x%02X 0x%02X" % self.get_button("g3")
+        )
+        to_return.append(
+            "              G4 0x%02X 0x%02X 0x%02X" % self.get_button("g4")
+        )
+        to_return.append(
+            "              G5 0x%02X 0x%02X 0x%02X" % self.get_button("g5")
+        )
+        to_return.append(
+            "              G6 0x%02X 0x%02X 0x%02X" % self.get_button("g6")
+        )
+        to_return.append(
+            "              G7 0x%02X 0x%02X 0x%02X" % self.get_button("g7")
+        )
+        to_return.append(
+            "              G8 0x%02X 0x%02X 0x%02X" % self.get_button("g8")
+        )
+        to_return.append(
+            "              G9 0x%02X 0x%02X 0x%02X" % self.get_button("g9")
+        )
+        to_return.append(
+            "             G10 0x%02X 0x%02X 0x%02X" % self.get_button("g10")
+        )
+        to_return.append(
+            "             G11 0x%02X 0x%02X 0x%02X" % self.get_button("g11")
+        )
+        to_return.append(
+            "             G12 0x%02X 0x%02X 0x%02X" % self.get_button("g12")
+        )
+        to_return.append(
+            "             G13 0x%02X 0x%02X 0x%02X" % self.get_button("g13")
+        )
+        to_return.append(
+            "             G14 0x%02X 0x%02X 0x%02X" % self.get_button("g14")
+        )
+        to_return.append(
+            "             G15 0x%02X 0x%02X 0x%02X" % self.get_button("g15")
+        )
+        to_return.append(
+            "             G16 0x%02X 0x%02X 0x%02X" % self.get_button("g16")
+        )
+        to_return.append(
+            "             G17 0x%02X 0x%02X 0x%02X" % self.get_button("g17")
+        )
+        to_return.append(
+            "             G18 0x%02X 0x%02X 0x%02X" % self.get_button("g18")
+        )
+        to_return.append(
+            "             G19 0x%02X 0x%02X 0x%02X" % self.get_button("g19")
+        )
+        to_return.append(
+            "             G20 0x%02X 0x%02X 0x%02X" % self.get_button("g20")
+        )
+        to_return.append("G-Shift color %s" % (self.gshift_color,))
+        to_return.append(
+            "Left Click    G1 0x%02X 0x%02X 0x%02X"
+            % self.get_gshift_button("LEFT_CLICK")
+        )
+        to_return.append(
+            "Right Click   G2 0x%02X 0x%02X 0x%02X"
+            % self.get_gshift_button("RIGHT_CLICK")
+        )
+        to_return.append(
+            "              G3 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g3")
+        )
+        to_return.append(
+            "              G4 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g4")
+        )
+        to_return.append(
+            "              G5 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g5")
+        )
+        to_return.append(
+            "              G6 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g6")
+        )
+        to_return.append(
+            "              G7 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g7")
+        )
+        to_return.append(
+            "              G8 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g8")
+        )
+        to_return.append(
+            "              G9 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g9")
+        )
+        to_return.append(
+            "             G10 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g10")
+        )
+        to_return.append(
+            "             G11 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g11")
+        )
+        to_return.append(
+            "             G12 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g12")
+        )
+        to_return.append(
+            "             G13 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g13")
+        )
+        to_return.append(
+            "             G14 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g14")
+        )
+        to_return.append(
+            "             G15 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g15")
+        )
+        to_return.append(
+            "             G16 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g16")
+        )
+        to_return.append(
+            "             G17 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g17")
+        )
+        to_return.append(
+            "             G18 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g18")
+        )
+        to_return.append(
+            "             G19 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g19")
+        )
+        to_return.append(
+            "             G20 0x%02X 0x%02X 0x%02X" % self.get_gshift_button("g20")
+        )
+        return "\n".join(to_return)
+
+
+# G600 defaults for every new profile (report id 0xF3, replaced by __init__)
+_template = LogitechG600Profile.__new__(LogitechG600Profile)
+_template._install_defaults()
+DEFAULT_REPORT: bytes = bytes(_template.feature_report())
+del _template
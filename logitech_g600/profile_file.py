@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import tomllib
+from pathlib import Path
+
+from logitech_g600 import keys
+from logitech_g600.profile import LogitechG600Profile
+
+# Profiles as data (TOML or JSON). Every key is optional except "profile", anything
+# not given keeps the G600 default from LogitechG600Profile.__init__. Unknown keys
+# and values of the wrong type are a ValueError naming the key.
+#
+#   profile = 0                      # 0, 1 or 2 (report 0xF3, 0xF4, 0xF5)
+#   color = [255, 0, 0]
+#   gshift_color = [0, 255, 255]
+#   led_effect = "solid"             # "solid", "breathe", "cycle" or the byte value
+#   led_duration = 0                 # seconds, 0-15
+#   frequency = 125                  # 125, 250, 500 or 1000 Hz
+#   dpi_shift = 200
+#   dpis = [3200, 2000, 1200, 400]
+#   dpi_default = 1200               # must be one of dpis
+#
+#   [buttons]                        # G1-G20 or LEFT_CLICK, RIGHT_CLICK, ...
+#   G9 = "CTRL+CMD+SHIFT+4"          # any MOD+MOD+KEY chord or name, see keys.py
+#   G4 = [0, 0, 0x81]                # or (code, modifier, key)
+#
+#   [gshift_buttons]
+#   G9 = "MEH+1"
+#
+# A profile can build on another profile file and derive its G-shift layer:
+#
+#   base = "team.toml"               # relative to this file, its keys are the defaults
+#   profile = 1
+#   color = [0, 255, 0]
+#
+#   [gshift_layer]                   # G-shift = normal layer plus modifier
+#   modifier = "LEFT_CTRL"
+#   buttons = ["G9", "G10"]          # default all 20, [gshift_buttons] still override
+#
+# Tables (buttons, gshift_buttons, gshift_layer) are merged key by key with the
+# base, other keys replace it.
+
+# bump when the way a profile file maps to a report changes, invalidates the cache
+COMPILER_VERSION: int = 3
+
+MERGED_TABLES: tuple = ("buttons", "gshift_buttons", "gshift_layer")
+
+LED_EFFECTS: dict = {
+    "solid": LogitechG600Profile.LED_EFFECT_SOLID,
+    "breathe": LogitechG600Profile.LED_EFFECT_BREATHE,
+    "cycle": LogitechG600Profile.LED_EFFECT_LED_CYCLE,
+}
+
+
+def default_cache_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_home) / "logitech_g600" / "compiled"
+
+
+def parse_profile_data(content: bytes, path: str | Path = "") -> dict:
+    if str(path).endswith(".json"):
+        return json.loads(content)
+    return tomllib.loads(content.decode())
+
+
+PROFILE_KEYS: frozenset = frozenset(
+    {
+        "base",
+        "profile",
+        "color",
+        "gshift_color",
+        "led_effect",
+        "led_duration",
+        "frequency",
+        "dpi_shift",
+        "dpis",
+        "dpi_default",
+        "buttons",
+        "gshift_buttons",
+        "gshift_layer",
+    }
+)
+GSHIFT_LAYER_KEYS: frozenset = frozenset({"modifier", "buttons"})
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _int(data: dict, key: str) -> int:
+    value = data[key]
+    if not _is_int(value):
+        raise ValueError("Invalid %s %r, expected an integer" % (key, value))
+    return value
+
+
+def _int_list(data: dict, key: str, length: int) -> list[int]:
+    value = data[key]
+    if not isinstance(value, list) or len(value) != length or not all(map(_is_int, value)):
+        raise ValueError("Invalid %s %r, expected %d integers" % (key, value, length))
+    return value
+
+
+def _table(data: dict, key: str) -> dict:
+    value = data.get(key, {})
+    if not isinstance(value, dict):
+        raise ValueError("Invalid %s %r, expected a table" % (key, value))
+    return value
+
+
+def _button_value(value) -> tuple[int, int, int]:
+    if isinstance(value, str):
+        return keys.parse_binding(value)  # ValueError for unknown names
+    if (
+        not isinstance(value, list)
+        or len(value) != 3
+        or any(not _is_int(v) or v not in range(256) for v in value)
+    ):
+        raise ValueError("Invalid button value %r, expected a name or (code, modifier, key)" % (value,))
+    return tuple(value)
+
+
+def _set_buttons(table: str, buttons: dict, set_button) -> None:
+    for button_name, value in buttons.items():
+        try:
+            set_button(button_name, value=_button_value(value))
+        except ValueError as e:
+            raise ValueError("%s.%s: %s" % (table, button_name, e))
+
+
+def profile_from_dict(data: dict) -> LogitechG600Profile:
+    # ValueError naming the key for anything unknown or of the wrong type
+    unknown = sorted(set(data) - PROFILE_KEYS)
+    if unknown:
+        raise ValueError("Unknown key %s" % ", ".join(unknown))
+    if "profile" not in data:
+        raise ValueError("Missing profile number")
+    profile = LogitechG600Profile(_int(data, "profile"))
+    if "color" in data:
+        profile.color = tuple(_int_list(data, "color", 3))
+    if "gshift_color" in data:
+        profile.gshift_color = tuple(_int_list(data, "gshift_color", 3))
+    if "led_effect" in data:
+        effect = data["led_effect"]
+        if isinstance(effect, str):
+            if effect not in LED_EFFECTS:
+                raise ValueError("Invalid led effect %s" % effect)
+            effect = LED_EFFECTS[effect]
+        elif not _is_int(effect) or effect not in range(256):
+            raise ValueError("Invalid led_effect %r" % (effect,))
+        profile.led_effect = effect
+    if "led_duration" in data:
+        if _int(data, "led_duration") not in range(16):
+            raise ValueError("Invalid led duration %s" % data["led_duration"])
+        profile.led_duration = data["led_duration"]
+    if "frequency" in data:
+        profile.frequency = _int(data, "frequency")
+    if "dpi_shift" in data:
+        profile.dpi_shift = _int(data, "dpi_shift")
+    if "dpis" in data:
+        profile.dpi1, profile.dpi2, profile.dpi3, profile.dpi4 = _int_list(data, "dpis", 4)
+    if "dpi_default" in data:
+        profile.dpi_default = _int(data, "dpi_default")
+    _set_buttons("buttons", _table(data, "buttons"), profile.set_button)
+    if "gshift_layer" in data:
+        layer = _table(data, "gshift_layer")
+        unknown = sorted(set(layer) - GSHIFT_LAYER_KEYS)
+        if unknown:
+            raise ValueError("Unknown key gshift_layer.%s" % ", gshift_layer.".join(unknown))
+        modifier_name = layer.get("modifier", "NONE")
+        if not isinstance(modifier_name, str):
+            raise ValueError("Invalid gshift_layer.modifier %r" % (modifier_name,))
+        code, modifier, key = keys.parse_binding(modifier_name)
+        if code or key:
+            raise ValueError("Invalid gshift_layer modifier %s" % modifier_name)
+        button_names = layer.get("buttons")
+        if button_names is not None and (
+            not isinstance(button_names, list) or not all(isinstance(b, str) for b in button_names)
+        ):
+            raise ValueError("Invalid gshift_layer.buttons %r, expected button names" % (button_names,))
+        profile.derive_gshift_layer(modifier, button_names)
+    _set_buttons("gshift_buttons", _table(data, "gshift_buttons"), profile.set_gshift_button)
+    return profile
+
+
+def _table_key(table: str, key: str) -> str:
+    # "g9", "LEFT_CLICK" and "G1" style button names merge as the same button
+    if table == "gshift_layer":
+        return key
+    index = LogitechG600Profile.BUTTON_ORDER.get(key.upper())
+    return key.upper() if index is None else "G%d" % (index + 1)
+
+
+def merge_profile_data(base: dict, data: dict) -> dict:
+    merged = dict(base)
+    for key, value in data.items():
+        if key == "base":
+            continue
+        if key in MERGED_TABLES:
+            table = {_table_key(key, k): v for k, v in _table(base, key).items()}
+            table.update({_table_key(key, k): v for k, v in _table(data, key).items()})
+            merged[key] = table
+        else:
+            merged[key] = value
+    merged.pop("base", None)
+    return merged
+
+
+def _digest(content: bytes, path: str | Path) -> str:
+    return hashlib.sha256(
+        b"%d:%s:" % (COMPILER_VERSION, Path(path).suffix.encode()) + content
+    ).hexdigest()
+
+
+class ProfileBuilder:
+    # Compiles profile files to reports. Every file is read, hashed and parsed at
+    # most once per builder, so many profiles sharing a few bases only resolve the
+    # bases once. Compiled reports are cached on disk keyed by the file's hash and
+    # resolved path (a relative base depends on the directory), next to the hashes
+    # of the base files it was built from: a profile is recompiled only when it or
+    # one of its bases changed.
+    #
+    #   builder = ProfileBuilder()
+    #   reports = [builder.compile(path) for path in paths]
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.compiled = 0  # profiles compiled
+        self.cached = 0  # profiles taken from the cache
+        self._files = {}  # path -> (content, digest)
+        self._resolved = {}  # path -> (data, {base path: digest})
+
+    def _read(self, path: Path) -> tuple[bytes, str]:
+        if path not in self._files:
+            content = path.read_bytes()
+            self._files[path] = (content, _digest(content, path))
+        return self._files[path]
+
+    def resolve(self, path: str | Path, _chain: tuple = ()) -> tuple[dict, dict]:
+        # (profile data with its bases merged in, {base path: digest})
+        path = Path(path).resolve()
+        if path in _chain:
+            raise ValueError("Circular base %s" % path)
+        if path not in self._resolved:
+            content, _ = self._read(path)
+            data = parse_profile_data(content, path)
+            if not isinstance(data, dict):
+                raise ValueError("%s is not a table of profile settings" % path)
+            deps = {}
+            if "base" in data:
+                if not isinstance(data["base"], str):
+                    raise ValueError("Invalid base %r, expected a file name" % (data["base"],))
+                base_path = path.parent / data["base"]
+                base, base_deps = self.resolve(base_path, _chain + (path,))
+                deps = dict(base_deps)
+                deps[str(base_path.resolve())] = self._read(base_path.resolve())[1]
+                data = merge_profile_data(base, data)
+            self._resolved[path] = (data, deps)
+        return self._resolved[path]
+
+    def _deps_current(self, deps: dict) -> bool:
+        try:
+            return all(self._read(Path(p))[1] == digest for p, digest in deps.items())
+        except OSError:
+            return False
+
+    def compile(self, path: str | Path) -> bytes:
+        # cache entry: the 154 byte report, followed by the base digests as JSON if
+        # the profile has a base
+        path = Path(path).resolve()
+        _, digest = self._read(path)
+        key = hashlib.sha256(("%s\0%s" % (digest, path)).encode()).hexdigest()
+        cached = self.cache_dir / (key + ".bin")
+        try:
+            entry = cached.read_bytes()
+            report = entry[:154]
+            deps = json.loads(entry[154:]) if len(entry) > 154 else {}
+            if len(report) == 154 and self._deps_current(deps):
+                self.cached += 1
+                return report
+        except (OSError, ValueError):
+            pass
+        data, deps = self.resolve(path)
+        report = bytes(profile_from_dict(data).feature_report())
+        self.compiled += 1
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(".tmp%d" % os.getpid())
+            tmp.write_bytes(report + (json.dumps(deps).encode() if deps else b""))
+            os.replace(tmp, cached)
+        except OSError:
+            pass  # a read-only cache only costs speed
+        return report
+
+
+def load_profile(path: str | Path) -> LogitechG600Profile:
+    # always parses and validates, see compile_profile_file() for the cached path
+    data, _ = ProfileBuilder().resolve(path)
+    return profile_from_dict(data)
+
+
+def compile_profile_file(
+    path: str | Path, cache_dir: str | Path | None = None
+) -> bytes:
+    # The 154 byte report for a profile file, see ProfileBuilder
+    return ProfileBuilder(cache_dir).compile(path)
+
+
+def compile_profile_files(paths, cache_dir: str | Path | None = None) -> list[bytes]:
+    # one builder, bases shared by several files are resolved once
+    builder = ProfileBuilder(cache_dir)
+    return [builder.compile(path) for path in paths]
+
+
+def load_compiled_profile(
+    path: str | Path, cache_dir: str | Path | None = None
+) -> LogitechG600Profile:
+    return LogitechG600Profile.from_report(compile_profile_file(path, cache_dir))
+
+
+def load_compiled_profiles(paths, cache_dir: str | Path | None = None) -> list[LogitechG600Profile]:
+    return [LogitechG600Profile.from_report(r) for r in compile_profile_files(paths, cache_dir)]
@@ -0,0 +1,74 @@
+import time
+
+from logitech_g600.device import ActiveProfile, G600Session
+
+# Reports changes of the active profile (e.g. the PROFILE_CYCLE_UP button) and of
+# the resolution, read from the 0xF0 report of an open session.
+#
+# poll mode     read 0xF0 every interval seconds, sleeping in between
+# input mode    block on the mouse's input reports and read 0xF0 when the mouse is
+#               used (at most every min_interval seconds), with a read every
+#               interval seconds while idle. A profile button press is input
+#               activity, so changes show up right away without busy polling.
+#
+#   with G600Session() as session:
+#       for state in ActiveProfileWatcher(session).changes():
+#           print(state.profile)
+
+
+class ActiveProfileWatcher:
+    def __init__(
+        self,
+        session: G600Session,
+        interval: float = 1.0,
+        input_driven: bool = False,
+        min_interval: float = 0.05,
+        report_length: int = 8,
+        max_drain: int = 64,
+    ):
+        self.session = session
+        self.interval = interval
+        self.input_driven = input_driven
+        self.min_interval = min_interval
+        self.report_length = report_length
+        self.max_drain = max_drain
+        self.state = None  # last ActiveProfile seen
+        self._stopped = False
+
+    def _wait(self) -> None:
+        if not self.input_driven:
+            time.sleep(self.interval)
+            return
+        deadline = time.monotonic() + self.interval
+        while not self._stopped:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.session.read_input_report(self.report_length, max(1, int(remaining * 1000))):
+                # drain what is queued so a burst of motion costs one 0xF0 read, at
+                # most max_drain reports: at 1000 Hz the queue never runs empty
+                for _ in range(self.max_drain):
+                    if not self.session.read_input_report(self.report_length, 0):
+                        break
+                time.sleep(self.min_interval)
+                return
+
+    def changes(self, initial: bool = True):
+        # yields an ActiveProfile whenever profile or resolution change, until stop()
+        self.state = self.session.read_active_state()
+        if initial:
+            yield self.state
+        while not self._stopped:
+            self._wait()
+            if self._stopped:
+                break
+            state = self.session.read_active_state()
+            if state != self.state:
+                self.state = state
+                yield state
+
+    def stop(self) -> None:
+        self._stopped = True
+
+
+__all__ = ["ActiveProfile", "ActiveProfileWatcher"]
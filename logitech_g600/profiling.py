@@ -0,0 +1,155 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+# Opt-in cProfile + tracemalloc around a whole command, for attributing slow runs
+# on a particular host without changing code:
+#
+#   g600 --perf-output /tmp/perf write profiles/*.toml
+#   G600_PERF_OUTPUT=/tmp/perf sudo -E uv run write_logitech_g600_profiles.py
+#
+# writes three files named g600-<command>-<time>-<pid> into the directory:
+#
+#   .prof          cProfile data, for pstats, snakeviz, ...
+#   .alloc.txt     top allocation sites (tracemalloc) and peak traced memory
+#   .summary.txt   startup breakdown and the slowest functions
+#
+# The breakdown is taken from the profile: the time spent in each phase's functions
+# when not called from another function of the same phase, so nested calls are not
+# counted twice. "imports before main" is the time from importing this module (the
+# first import of the CLI and the scripts) to the start of the run.
+
+# imported first by cli.py and the scripts, so this is close to process start
+STARTED: float = time.perf_counter()
+
+ENV_VAR: str = "G600_PERF_OUTPUT"
+TRACEMALLOC_FRAMES: int = 10
+TOP_FUNCTIONS: int = 30
+TOP_ALLOCATIONS: int = 25
+
+# phase -> (file name, function name or None for every function but <module>)
+PHASES: dict = {
+    "imports": [("<frozen importlib._bootstrap>", "_find_and_load")],
+    "profile construction": [
+        ("profile.py", None),
+        ("profile_file.py", None),
+        ("codec.py", None),
+        ("keys.py", None),
+    ],
+    "device open": [("device.py", "_timed_open")],
+    "settle wait": [("device.py", "wait_until_ready")],
+    "I/O": [
+        ("device.py", "_read_feature_report"),
+        ("device.py", "write_profile_report"),
+        ("device.py", "set_active_profile"),
+        ("device.py", "read_input_report"),
+    ],
+}
+
+
+def output_dir_from_env() -> str | None:
+    return os.environ.get(ENV_VAR) or None
+
+
+def _matches(func: tuple, patterns: list) -> bool:
+    filename, _, name = func
+    if name == "<module>":
+        return False
+    return any(
+        (filename == f or os.path.basename(filename) == f) and (n is None or n == name)
+        for f, n in patterns
+    )
+
+
+def phase_times(stats) -> dict[str, float]:
+    # stats: pstats.Stats. Seconds per PHASES entry, outermost calls only
+    times = {}
+    for phase, patterns in PHASES.items():
+        total = 0.0
+        for func, (_, _, _, ct, callers) in stats.stats.items():
+            if not _matches(func, patterns):
+                continue
+            if not callers:
+                total += ct
+            else:
+                # callers: caller -> (nc, cc, tt, ct) of the calls from that caller
+                total += sum(v[3] for caller, v in callers.items() if not _matches(caller, patterns))
+        times[phase] = total
+    return times
+
+
+class RunProfiler:
+    def __init__(self, output_dir: str, name: str):
+        self.output_dir = output_dir
+        self.name = name
+        self._profile = None
+        self._start = None
+        self._before_main = None
+
+    def start(self) -> None:
+        import cProfile
+        import tracemalloc
+
+        self._start = time.perf_counter()
+        self._before_main = self._start - STARTED
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> list[str]:
+        # writes the files, returns their paths
+        import tracemalloc
+
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._start
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # only after the snapshot, so they don't show up in it
+        import io
+        import pstats
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir,
+            "g600-%s-%s-%d" % (self.name, datetime.now().strftime("%Y%m%dT%H%M%S"), os.getpid()),
+        )
+        self._profile.dump_stats(base + ".prof")
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        with open(base + ".alloc.txt", "w") as f:
+            f.write("current %.1f KiB, peak %.1f KiB\n\n" % (current / 1024, peak / 1024))
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write("%s\n" % stat)
+
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        with open(base + ".summary.txt", "w") as f:
+            f.write("command: %s\n" % " ".join(sys.argv))
+            f.write("%-24s %9.3f s\n" % ("imports before main", self._before_main))
+            for phase, seconds in phase_times(stats).items():
+                f.write("%-24s %9.3f s\n" % (phase, seconds))
+            f.write("%-24s %9.3f s\n\n" % ("total run", elapsed))
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            f.write(out.getvalue())
+        return [base + ".prof", base + ".alloc.txt", base + ".summary.txt"]
+
+
+def run(func, name: str, output_dir: str | None = None, *args):
+    # func(*args) under a RunProfiler if output_dir (default $G600_PERF_OUTPUT) is set
+    output_dir = output_dir or output_dir_from_env()
+    if not output_dir:
+        return func(*args)
+    profiler = RunProfiler(output_dir, name)
+    profiler.start()
+    try:
+        return func(*args)
+    finally:
+        for path in profiler.stop():
+            print("wrote %s" % path, file=sys.stderr)
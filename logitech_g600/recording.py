@@ -0,0 +1,230 @@
+import mmap
+import os
+import struct
+import time
+
+from logitech_g600.input_stream import INPUT_REPORT_LENGTH
+from logitech_g600.transport import ACTIVE_PROFILE_REPORT_ID, Transport
+
+# Append-only log of timestamped input reports.
+#
+#   header (16 bytes)  magic "G600REC\0", version (u16), report length (u16), 4 reserved
+#   records            timestamp in ns (i64, time.monotonic_ns()), report length (u16),
+#                      report padded with zeroes to the header's report length
+#
+# Every record has the same size so the log can be scanned from an mmap without
+# parsing and resumed after a crash by truncating to a whole number of records.
+
+MAGIC: bytes = b"G600REC\x00"
+VERSION: int = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD_HEAD = struct.Struct("<qH")
+
+
+def record_struct(report_length: int) -> struct.Struct:
+    return struct.Struct("<qH%ds" % report_length)
+
+
+class InputRecorder:
+    # Writes records in batches through one preallocated buffer, memory use does not
+    # grow with the length of the capture.
+
+    def __init__(
+        self, path: str, report_length: int = INPUT_REPORT_LENGTH, batch: int = 256
+    ):
+        self.path = path
+        self.report_length = report_length
+        self.record = record_struct(report_length)
+        self.count = 0
+        self._buf = bytearray(self.record.size * batch)
+        self._pending = 0
+        self._batch = batch
+        if os.path.exists(path) and os.path.getsize(path):
+            _check_header(path, report_length)
+        self._f = open(path, "ab")
+        if self._f.tell() == 0:
+            self._f.write(HEADER.pack(MAGIC, VERSION, report_length))
+        else:
+            # drop a partial record left by an interrupted writer
+            whole = (self._f.tell() - HEADER.size) // self.record.size
+            self._f.truncate(HEADER.size + whole * self.record.size)
+            self._f.seek(0, os.SEEK_END)
+
+    def write(self, data, timestamp_ns: int | None = None) -> None:
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        data = bytes(data[: self.report_length])
+        self.record.pack_into(
+            self._buf, self._pending * self.record.size, timestamp_ns, len(data), data
+        )
+        self._pending += 1
+        self.count += 1
+        if self._pending == self._batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._f.write(memoryview(self._buf)[: self._pending * self.record.size])
+            self._pending = 0
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self) -> "InputRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _check_header(path: str, report_length: int | None = None) -> int:
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+    if len(head) != HEADER.size:
+        raise ValueError("%s is not an input recording (too short)" % path)
+    magic, version, length = HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("%s is not an input recording" % path)
+    if report_length is not None and length != report_length:
+        raise ValueError(
+            "%s has %d byte reports, not %d" % (path, length, report_length)
+        )
+    return length
+
+
+def record_session(
+    session, recorder: InputRecorder, seconds: float | None = None, read_timeout_ms: int = 100
+) -> None:
+    # Raw input reports straight from the device into the log, each stamped with
+    # time.monotonic_ns() as it is read. No InputEvent objects, no asyncio. Runs
+    # for seconds, or until KeyboardInterrupt / EOFError (a ReplayTransport).
+    deadline = None if seconds is None else time.monotonic() + seconds
+    read = session.read_input_report
+    write = recorder.write
+    length = recorder.report_length
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            data = read(length, read_timeout_ms)
+            if data:
+                write(data, time.monotonic_ns())
+    except EOFError:
+        pass
+    finally:
+        recorder.flush()
+
+
+class InputLog:
+    # Read-only, memory-mapped view of a recording. Records are returned as
+    # (timestamp_ns, memoryview) without copying the report bytes.
+
+    def __init__(self, path: str):
+        self.path = path
+        self.report_length = _check_header(path)
+        self.record = record_struct(self.report_length)
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._count = (size - HEADER.size) // self.record.size
+        if self._count:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mv = memoryview(self._mm)
+        else:
+            self._mm = None
+            self._mv = memoryview(b"")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> tuple[int, memoryview]:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        offset = HEADER.size + i * self.record.size
+        timestamp_ns, length = RECORD_HEAD.unpack_from(self._mv, offset)
+        start = offset + RECORD_HEAD.size
+        return timestamp_ns, self._mv[start : start + length]
+
+    def __iter__(self):
+        size = self.record.size
+        mv = self._mv
+        unpack_from = RECORD_HEAD.unpack_from
+        for offset in range(HEADER.size, HEADER.size + self._count * size, size):
+            timestamp_ns, length = unpack_from(mv, offset)
+            start = offset + RECORD_HEAD.size
+            yield timestamp_ns, mv[start : start + length]
+
+    def duration_ns(self) -> int:
+        if not self._count:
+            return 0
+        return self[-1][0] - self[0][0]
+
+    def close(self) -> None:
+        self._mv.release()
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "InputLog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ReplayTransport(Transport):
+    # Plays an InputLog back as if it was a device, so G600Session and InputStream
+    # consumers work unchanged. speed 1.0 keeps the original timing, 10.0 is ten
+    # times faster and 0 replays as fast as possible. read() raises EOFError once
+    # the log is exhausted.
+
+    def __init__(self, log: InputLog, speed: float = 1.0):
+        self.log = log
+        self.speed = speed
+        self.manufacturer = "Logitech"
+        self.product = "G600 Gaming Mouse (replay)"
+        self.serial_number = "REPLAY"
+        self._records = iter(log)
+        self._next = None
+        self._start_wall = None
+        self._start_ts = None
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        # a pending record would keep the log's mmap exported past InputLog.close()
+        self._next = None
+        self._records.close()
+
+    def get_feature_report(self, report_id: int, length: int) -> list[int]:
+        if report_id == ACTIVE_PROFILE_REPORT_ID:
+            return [report_id, 0, 0, 0][:length]
+        raise OSError("a replay has no report 0x%02X" % report_id)
+
+    def send_feature_report(self, data) -> int:
+        return -1
+
+    def read(self, length: int, timeout_ms: int = 0) -> list[int]:
+        if self._next is None:
+            record = next(self._records, None)
+            if record is None:
+                raise EOFError("end of recording")
+            # a copy, kept across reads that return [] before it is due
+            self._next = (record[0], bytes(record[1]))
+        timestamp_ns, data = self._next
+        if self.speed > 0:
+            now = time.monotonic()
+            if self._start_wall is None:
+                self._start_wall, self._start_ts = now, timestamp_ns
+            due = self._start_wall + (timestamp_ns - self._start_ts) / 1e9 / self.speed
+            wait = due - now
+            if wait > 0:
+                if timeout_ms >= 0 and wait > timeout_ms / 1000:
+                    time.sleep(timeout_ms / 1000)
+                    return []
+                time.sleep(wait)
+        self._next = None
+        return list(data[:length])
@@ -0,0 +1,188 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Iterable, Iterator
+
+from logitech_g600 import codec, keys
+
+
+@dataclass(frozen=True)
+class DecodedReport:
+    # A profile report with units applied (Hz, dpi). Comparable with ==, hashable,
+    # and serializable with to_dict()
+    report_id: int
+    led_color: tuple  # (red, green, blue)
+    led_effect: int
+    led_duration: int  # seconds
+    frequency: int | None  # Hz, None if the byte is not one of the known rates
+    frequency_byte: int
+    dpi_shift: int  # dpi
+    dpi_default: int  # index in dpis
+    dpis: tuple  # 4 values in dpi
+    buttons: tuple  # 20 (code, modifier, key)
+    gshift_color: tuple  # (red, green, blue)
+    gshift_buttons: tuple  # 20 (code, modifier, key)
+    unknown1: bytes
+    unknown2: bytes
+
+    @property
+    def profile_number(self) -> int:
+        return self.report_id - 0xF3
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["unknown1"] = list(self.unknown1)
+        d["unknown2"] = list(self.unknown2)
+        return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def decode(data) -> DecodedReport:
+    r = codec.decode_report(data)
+    return DecodedReport(
+        report_id=r.report_id,
+        led_color=r.led_color,
+        led_effect=r.led_effect,
+        led_duration=r.led_duration,
+        # 1000 / (1 + byte), 0x00 1000Hz, 0x01 500Hz, 0x03 250Hz, 0x07 125Hz
+        frequency=codec.BYTE_TO_FREQUENCY.get(r.frequency_byte),
+        frequency_byte=r.frequency_byte,
+        dpi_shift=r.dpi_shift * 50,
+        dpi_default=r.dpi_default,
+        dpis=tuple(x * 50 for x in r.dpis),
+        buttons=r.buttons,
+        gshift_color=r.gshift_color,
+        gshift_buttons=r.gshift_buttons,
+        unknown1=r.unknown1,
+        unknown2=r.unknown2,
+    )
+
+
+def iter_binary_reports(f: BinaryIO, chunk_reports: int = 1024) -> Iterator[bytes]:
+    # Concatenated raw 154 byte reports. Reads chunk_reports reports at a time into
+    # one reused buffer and yields each record without re-copying the remainder.
+    buf = bytearray(codec.REPORT_LENGTH * chunk_reports)
+    mv = memoryview(buf)
+    pending = 0
+    while True:
+        n = f.readinto(mv[pending:])
+        if not n:
+            break
+        pending += n
+        whole = pending - pending % codec.REPORT_LENGTH
+        for offset in range(0, whole, codec.REPORT_LENGTH):
+            yield bytes(mv[offset : offset + codec.REPORT_LENGTH])
+        # move the partial record (if any) to the front of the buffer
+        buf[: pending - whole] = buf[whole:pending]
+        pending -= whole
+    if pending:
+        raise ValueError(
+            "Trailing %d bytes, not a whole %d byte report"
+            % (pending, codec.REPORT_LENGTH)
+        )
+
+
+def iter_text_reports(lines: Iterable[str]) -> Iterator[bytes]:
+    # One report per line, printed as a list of int like "[243, 0, 0, ...]".
+    # Anything else is a ValueError naming the line
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            values = json.loads(line)
+        except ValueError as e:
+            raise ValueError("line %d: %s" % (number, e))
+        if not isinstance(values, list) or not all(
+            isinstance(v, int) and 0 <= v <= 255 for v in values
+        ):
+            raise ValueError("line %d: not a list of byte values" % number)
+        yield bytes(values)
+
+
+def iter_report_file(path: str) -> Iterator[bytes]:
+    # Every raw report in a dump file, either raw binary or one list per line
+    with open(path, "rb") as f:
+        first = f.peek(1)[:1] if hasattr(f, "peek") else b""
+        if first == b"[":
+            with open(path) as text:
+                yield from iter_text_reports(text)
+        else:
+            yield from iter_binary_reports(f)
+
+
+def load_reports(path: str) -> Iterator[DecodedReport]:
+    for data in iter_report_file(path):
+        yield decode(data)
+
+
+code_mappings = {
+    0x00: "None",
+    0x01: "BUTTON1",
+    0x02: "BUTTON2",
+    0x03: "BUTTON3",
+    0x04: "BUTTON4",
+    0x05: "BUTTON5",
+    0x11: "RESOLUTION_UP",
+    0x12: "RESOLUTION_DOWN",
+    0x13: "RESOLUTION_CYCLE_UP",
+    0x14: "PROFILE_CYCLE_UP",
+    0x15: "RESOLUTION_ALTERNATE",
+    0x16: "RESOLUTION_DEFAULT",
+    0x17: "SECOND_MODE",
+}
+
+# full Keyboard/Keypad page 0x07, see keys.py
+keyboard_hut_table = keys.KEY_NAMES
+
+
+def print_logitech_button(buttonname, code, modifier, key):
+    code_str = code_mappings.get(code, "")
+    key_str = keyboard_hut_table.get(key, "unknown")
+    modifier_str = get_modifiers_string(modifier)
+    # print(type(modifier))
+    # print("  Key %3s 0x%02X(%20s) %b (%s) %2d (%10s)" % (buttonname,code, code_str, modifier, get_modifiers_string(modifier), key, key_str))
+    name = keys.binding_name(code, modifier, key) or ""
+    print(f"  Key {buttonname:3s} 0x{code:02x}({code_str:20s}) 0b{modifier:08b} ({modifier_str:20s}) 0x{key:02X} ({key_str:10s}) {name}")
+
+
+def get_modifiers_string(modifier):
+    modifiers = []
+    if modifier & 0x01:
+        modifiers.append("Left Control")
+    if modifier & 0x02:
+        modifiers.append("Left Shift")
+    if modifier & 0x04:
+        modifiers.append("Left Alt")
+    if modifier & 0x08:
+        modifiers.append("Left GUI")
+    if modifier & 0x10:
+        modifiers.append("Right Control")
+    if modifier & 0x20:
+        modifiers.append("Right Shift")
+    if modifier & 0x40:
+        modifiers.append("Right Alt")
+    if modifier & 0x80:
+        modifiers.append("Right GUI")
+    return ", ".join(modifiers)
+
+
+def print_feature_report(d):
+    if not isinstance(d, DecodedReport):
+        d = decode(d)
+    print("Feature Report")
+    print("  Report ID: %d" % d.report_id)
+    print("  LED: %d %d %d" % d.led_color)
+    print("  LED Effect: %d and duration %d" % (d.led_effect, d.led_duration))
+    frequency = 1000 / (1+d.frequency_byte)
+    print("  Frequency: %d" % frequency)
+    dpi_1, dpi_2, dpi_3, dpi_4 = d.dpis
+    dpi_default = d.dpis[d.dpi_default]
+    print("  DPI: shift:%d default:%d %d %d %d %d" % (d.dpi_shift, dpi_default, dpi_1, dpi_2, dpi_3, dpi_4))
+    # keys = sorted(keys, key=lambda x: x[0])
+    for i,(code, modifier, key) in enumerate(d.buttons):
+        print_logitech_button("G%d"%(i+1),code, modifier, key)
+    for i, (code, modifier, key) in enumerate(d.gshift_buttons):
+        print_logitech_button("G%d"%(i+1),code, modifier, key)
+    print("  G-Shift Color: %d %d %d" % d.gshift_color)
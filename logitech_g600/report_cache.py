@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_home) / "logitech_g600" / "written_reports.json"
+
+
+def report_hash(report) -> str:
+    return hashlib.sha256(bytes(report)).hexdigest()
+
+
+class WrittenReportCache:
+    # Remembers the hash of the last report written to each (device serial, report id)
+    # so that re-running the same write needs no device I/O at all.
+    #
+    # The cache trusts that nobody else (GHub, another host) changed the onboard
+    # profile since we wrote it. Use skip_unchanged (readback) when that is not true.
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self._entries = None
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def is_current(self, serial_number: str | None, report) -> bool:
+        if not serial_number:
+            return False
+        entry = self._load().get(serial_number, {})
+        return entry.get("0x%02X" % report[0]) == report_hash(report)
+
+    def remember(self, serial_number: str | None, report) -> None:
+        if not serial_number:
+            return
+        entry = self._load().setdefault(serial_number, {})
+        entry["0x%02X" % report[0]] = report_hash(report)
+        self.save()
+
+    def forget(self, serial_number: str) -> None:
+        if self._load().pop(serial_number, None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        # a temp file of our own, other writers (fleet threads, the daemon and the
+        # CLI) may be saving at the same time
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            try:
+                json.dump(self._load(), f, indent=1, sort_keys=True)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self.path)
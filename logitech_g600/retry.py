@@ -0,0 +1,59 @@
+import random
+import time
+from dataclasses import dataclass
+
+from logitech_g600.errors import G600Error
+
+# Retry with exponential backoff and jitter for device operations that fail while
+# another HID client (GHUB, Karabiner, ...) holds the mouse busy.
+#
+# A try fails when the operation raises OSError or returns -1 (hidapi's error
+# value). Try n waits initial_delay * multiplier ** (n - 1), capped at max_delay,
+# minus up to jitter of it at random. No new try is started when max_attempts is
+# reached or the wait would end after deadline seconds from the first try.
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    initial_delay: float = 0.05
+    max_delay: float = 1.0
+    multiplier: float = 2.0
+    jitter: float = 0.5  # fraction of the delay
+    deadline: float | None = 5.0  # seconds, None for no limit
+
+    def delay(self, attempt: int) -> float:
+        # seconds to wait after the attempt-th failed try (1 = the first)
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return delay - random.uniform(0, self.jitter * delay)
+
+    def call(self, func, *args, error: type[G600Error] = G600Error, message: str = "failed"):
+        # (result, retries) of the first successful try, raises error after the last
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                rc = func(*args)
+                if rc != -1:
+                    return rc, attempt - 1
+                cause = None
+            except OSError as e:
+                cause = e
+            delay = self.delay(attempt)
+            out_of_time = (
+                self.deadline is not None
+                and time.monotonic() - start + delay > self.deadline
+            )
+            if attempt >= self.max_attempts or out_of_time:
+                detail = ": %s" % cause if cause is not None else ""
+                raise error(
+                    "%s after %d attempt%s%s"
+                    % (message, attempt, "" if attempt == 1 else "s", detail),
+                    attempts=attempt,
+                ) from cause
+            time.sleep(delay)
+
+
+DEFAULT_RETRY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
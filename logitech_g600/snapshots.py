@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from logitech_g600 import codec
+from logitech_g600.device import G600Session
+from logitech_g600.transaction import ApplyResult, apply_profiles
+from logitech_g600.transport import PROFILE_REPORT_IDS
+
+# Local archive of what was on the devices: the three profile reports and the
+# active profile of a device at one point in time.
+#
+#   root/objects/ab/cdef...    one file per distinct report, named by its sha256
+#   root/index/<serial>.jsonl  one line per snapshot of that device
+#
+# Reports are stored once no matter how many snapshots (or devices) contain them, a
+# snapshot itself is one index line of hashes. Looking up a device only reads its
+# own index file.
+#
+#   store = SnapshotStore()
+#   with G600Session() as session:
+#       snapshot = store.take(session)
+#       ...
+#       restore_snapshot(session, store, snapshot)
+
+
+def default_store_path() -> Path:
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return Path(data_home) / "logitech_g600" / "snapshots"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    serial_number: str
+    timestamp: str  # ISO 8601, UTC
+    active_profile: int | None
+    hashes: tuple  # sha256 of profile reports 0, 1 and 2
+
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": self.timestamp,
+            "active_profile": self.active_profile,
+            "reports": list(self.hashes),
+        }
+
+
+class SnapshotStore:
+    def __init__(self, root: Path | str | None = None):
+        self.root = Path(root) if root is not None else default_store_path()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    def _index_path(self, serial_number: str) -> Path:
+        return self.root / "index" / (quote(serial_number, safe="") + ".jsonl")
+
+    def put_report(self, report) -> str:
+        report = bytes(report)
+        if len(report) != codec.REPORT_LENGTH:
+            raise ValueError("Invalid feature report length %d" % len(report))
+        digest = hashlib.sha256(report).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp%d" % os.getpid())
+            tmp.write_bytes(report)
+            os.replace(tmp, path)
+        return digest
+
+    def get_report(self, digest: str) -> bytes:
+        report = self._object_path(digest).read_bytes()
+        if hashlib.sha256(report).hexdigest() != digest:
+            raise ValueError("Snapshot object %s is corrupt" % digest)
+        return report
+
+    def add(
+        self,
+        serial_number: str,
+        reports,
+        active_profile: int | None = None,
+        timestamp: str | None = None,
+    ) -> Snapshot:
+        # reports: the 3 profile reports, in profile number order
+        reports = list(reports)
+        if len(reports) != len(PROFILE_REPORT_IDS):
+            raise ValueError("A snapshot needs %d profile reports" % len(PROFILE_REPORT_IDS))
+        snapshot = Snapshot(
+            serial_number=serial_number,
+            timestamp=timestamp or _now(),
+            active_profile=active_profile,
+            hashes=tuple(self.put_report(r) for r in reports),
+        )
+        index = self._index_path(serial_number)
+        index.parent.mkdir(parents=True, exist_ok=True)
+        with open(index, "a") as f:
+            f.write(json.dumps(snapshot.to_dict()) + "\n")
+        return snapshot
+
+    def take(self, session: G600Session) -> Snapshot:
+        # read the three profiles and the active profile of an open session
+        reports = [session.read_profile_report(n) for n in range(len(PROFILE_REPORT_IDS))]
+        active_profile = session.read_active_profile()
+        return self.add(session.serial_number or "unknown", reports, active_profile)
+
+    def serial_numbers(self) -> list[str]:
+        index_dir = self.root / "index"
+        if not index_dir.is_dir():
+            return []
+        return sorted(unquote(p.stem) for p in index_dir.glob("*.jsonl"))
+
+    def history(self, serial_number: str) -> list[Snapshot]:
+        # oldest first
+        try:
+            with open(self._index_path(serial_number)) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        return [
+            Snapshot(
+                serial_number=serial_number,
+                timestamp=d["timestamp"],
+                active_profile=d["active_profile"],
+                hashes=tuple(d["reports"]),
+            )
+            for d in lines
+        ]
+
+    def find(self, serial_number: str, at: str | None = None) -> Snapshot:
+        # latest snapshot of the device, or the latest one taken at or before at
+        # (a timestamp or a prefix of one, e.g. "2024-05-01")
+        for snapshot in reversed(self.history(serial_number)):
+            if at is None or snapshot.timestamp <= at or snapshot.timestamp.startswith(at):
+                return snapshot
+        raise ValueError(
+            "No snapshot of %s%s" % (serial_number, " at %s" % at if at else "")
+        )
+
+    def reports(self, snapshot: Snapshot) -> dict[int, bytes]:
+        return {n: self.get_report(digest) for n, digest in enumerate(snapshot.hashes)}
+
+
+def restore_snapshot(
+    session: G600Session, store: SnapshotStore, snapshot: Snapshot, force: bool = False
+) -> ApplyResult:
+    # one transaction (see logitech_g600.transaction), profiles already on the device
+    # are not written again
+    return apply_profiles(
+        session, store.reports(snapshot), activate=snapshot.active_profile, force=force
+    )
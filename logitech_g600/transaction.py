@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+
+from logitech_g600.device import PROFILE_REPORT_LENGTH, G600Session
+from logitech_g600.errors import ApplyError
+from logitech_g600.transport import PROFILE_REPORT_IDS
+
+# All-or-nothing apply of up to three profiles and the active profile in one open
+# session:
+#
+#   1. snapshot the three onboard reports and the active profile (0xF0), or take
+#      the caller's
+#   2. write the reports that differ from the snapshot, read each one back
+#   3. select the active profile (0xF0) and read it back
+#
+# If any step fails the reports written so far and the active profile are restored
+# from the snapshot and ApplyError is raised. A report whose length or report id
+# doesn't match its profile number raises ValueError before step 1.
+#
+#   with G600Session() as session:
+#       apply_profiles(session, [profile0, profile1, profile2], activate=0)
+
+
+@dataclass
+class ApplyResult:
+    written: list[int] = field(default_factory=list)  # profile numbers sent
+    unchanged: list[int] = field(default_factory=list)  # already on the device
+    activated: int | None = None
+    rolled_back: bool = False
+    snapshot: dict = field(default_factory=dict)  # profile number -> report before
+    previous_active: int | None = None
+
+
+def _write_verified(session: G600Session, profile_number: int, report: bytes) -> None:
+    session.write_profile_report(report)  # WriteError once retries are exhausted
+    if bytes(session.read_profile_report(profile_number)) != report:
+        raise OSError("profile %d did not read back as written" % profile_number)
+
+
+def _activate_verified(session: G600Session, profile_number: int) -> None:
+    session.set_active_profile(profile_number)
+    if session.read_active_profile() != profile_number:
+        raise OSError("profile %d did not become the active profile" % profile_number)
+
+
+def _check_reports(reports: dict, activate: int | None, snapshot: dict | None) -> None:
+    # before anything is read or written: a report goes to the profile of its report
+    # id, a mismatch would overwrite another profile than the one rolled back
+    for profile_number, report in reports.items():
+        if profile_number not in range(len(PROFILE_REPORT_IDS)):
+            raise ValueError("Invalid profile number %s" % profile_number)
+        if len(report) != PROFILE_REPORT_LENGTH:
+            raise ValueError(
+                "Invalid feature report length %d for profile %d" % (len(report), profile_number)
+            )
+        if report[0] != PROFILE_REPORT_IDS[profile_number]:
+            raise ValueError(
+                "Report id 0x%02X is not the one of profile %d (0x%02X)"
+                % (report[0], profile_number, PROFILE_REPORT_IDS[profile_number])
+            )
+    if activate is not None and activate not in range(len(PROFILE_REPORT_IDS)):
+        raise ValueError("Invalid profile number %s" % activate)
+    if snapshot is not None:
+        # a caller's snapshot must be able to roll back every profile written
+        for profile_number in reports:
+            before = snapshot.get(profile_number)
+            if before is None or len(before) != PROFILE_REPORT_LENGTH:
+                raise ValueError("The snapshot has no valid report for profile %d" % profile_number)
+
+
+def _rollback(
+    session: G600Session, result: ApplyResult, touched: list[int], activating: bool
+) -> bool:
+    # best effort, every step is tried even if an earlier one fails
+    ok = True
+    for profile_number in touched:
+        try:
+            _write_verified(session, profile_number, result.snapshot[profile_number])
+        except (OSError, ValueError):
+            ok = False
+    if activating:
+        try:
+            _activate_verified(session, result.previous_active)
+        except (OSError, ValueError):
+            ok = False
+    return ok
+
+
+def apply_profiles(
+    session: G600Session,
+    profiles,
+    activate: int | None = None,
+    force: bool = False,
+    snapshot: dict | None = None,
+    previous_active: int | None = None,
+) -> ApplyResult:
+    # profiles: LogitechG600Profile instances, or {profile number: 154 byte report}
+    # force: write even the reports that are already on the device
+    # snapshot / previous_active: what the caller knows to be on the device (e.g. a
+    # cache kept up to date), used instead of reading it back for step 1
+    if isinstance(profiles, dict):
+        reports = {n: bytes(r) for n, r in profiles.items()}
+    else:
+        reports = {p.profile_number: bytes(p.feature_report()) for p in profiles}
+    _check_reports(reports, activate, snapshot)
+    result = ApplyResult()
+    if snapshot is not None:
+        result.snapshot = {n: bytes(r) for n, r in snapshot.items()}
+    else:
+        result.snapshot = {
+            n: bytes(session.read_profile_report(n)) for n in range(len(PROFILE_REPORT_IDS))
+        }
+    if previous_active is None:
+        previous_active = session.read_active_profile()
+    result.previous_active = previous_active
+
+    touched = []
+    activating = False
+    try:
+        for profile_number, report in sorted(reports.items()):
+            if not force and result.snapshot[profile_number] == report:
+                result.unchanged.append(profile_number)
+                continue
+            touched.append(profile_number)
+            _write_verified(session, profile_number, report)
+            result.written.append(profile_number)
+        if activate is not None:
+            activating = True
+            _activate_verified(session, activate)
+            result.activated = activate
+    except (OSError, ValueError) as e:
+        result.rolled_back = _rollback(session, result, touched, activating)
+        if result.rolled_back:
+            message = "%s, restored the previous profiles" % e
+        else:
+            message = "%s, restoring the previous profiles failed too" % e
+        raise ApplyError(message, result) from e
+    return result
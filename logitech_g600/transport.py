@@ -0,0 +1,234 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Iterable
+
+from logitech_g600 import codec
+
+VENDOR_ID: int = 0x046D  # Logitech
+PRODUCT_ID: int = 0xC24A  # G600
+
+ACTIVE_PROFILE_REPORT_ID: int = 0xF0
+PROFILE_REPORT_IDS: tuple = (0xF3, 0xF4, 0xF5)
+
+
+class Transport:
+    # What G600Session needs from a device. The methods follow hidapi's hid.device:
+    # send_feature_report returns the bytes written or -1, reads return a list of int
+    # and failures raise OSError.
+    manufacturer: str | None = None
+    product: str | None = None
+    serial_number: str | None = None
+
+    def open(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def get_feature_report(self, report_id: int, length: int) -> list[int]:
+        raise NotImplementedError
+
+    def send_feature_report(self, data) -> int:
+        raise NotImplementedError
+
+    def read(self, length: int, timeout_ms: int = 0) -> list[int]:
+        # one input report, [] if none arrived within timeout_ms (0 = don't wait,
+        # < 0 = wait until one arrives)
+        raise NotImplementedError
+
+
+class HidapiTransport(Transport):
+    def __init__(self, path: bytes | None = None):
+        self.path = path
+        self._h = None
+        self._blocking = True
+
+    def open(self) -> None:
+        import hid  # only needed when a real device is used
+
+        h = hid.device()
+        if self.path is not None:
+            h.open_path(self.path)
+        else:
+            h.open(VENDOR_ID, PRODUCT_ID)
+        try:
+            self.manufacturer = h.get_manufacturer_string()
+            self.product = h.get_product_string()
+            self.serial_number = h.get_serial_number_string()
+        except BaseException:
+            h.close()
+            raise
+        self._h = h
+        self._blocking = True
+
+    def close(self) -> None:
+        if self._h is not None:
+            self._h.close()
+            self._h = None
+
+    def get_feature_report(self, report_id: int, length: int) -> list[int]:
+        return self._h.get_feature_report(report_id, length)
+
+    def send_feature_report(self, data) -> int:
+        return self._h.send_feature_report(data)
+
+    def read(self, length: int, timeout_ms: int = 0) -> list[int]:
+        # hid.device.read() with a timeout of 0 is a plain hid_read(), which waits
+        # forever in blocking mode. Non-blocking mode makes 0 return right away, a
+        # positive timeout uses hid_read_timeout() either way.
+        blocking = timeout_ms < 0
+        if blocking != self._blocking:
+            self._h.set_nonblocking(0 if blocking else 1)
+            self._blocking = blocking
+        return self._h.read(length, timeout_ms)
+
+
+def _default_report(profile_number: int) -> bytes:
+    from logitech_g600.profile import LogitechG600Profile
+
+    return bytes(LogitechG600Profile(profile_number).feature_report())
+
+
+class SimulatedG600(Transport):
+    # In-memory G600: the three profile reports (0xF3-0xF5) and the active profile
+    # (0xF0), with optional latency, failures and a queue of input reports.
+    #
+    #   latency         seconds added to every operation (open, get, send, read)
+    #   error_rate      probability (0-1) that an operation fails like hidapi does
+    #                   (send returns -1, get raises OSError)
+    #   fail_open       number of next open() calls that raise OSError
+    #   seed            seed for error_rate, makes failures reproducible
+
+    def __init__(
+        self,
+        serial_number: str = "SIM0000",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        fail_open: int = 0,
+        input_reports: Iterable = (),
+        seed: int | None = None,
+    ):
+        self.manufacturer = "Logitech"
+        self.product = "G600 Gaming Mouse (simulated)"
+        self.serial_number = serial_number
+        self.path = b"sim:" + serial_number.encode()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_open = fail_open
+        self.reports = {
+            report_id: _default_report(n) for n, report_id in enumerate(PROFILE_REPORT_IDS)
+        }
+        self.active_profile = 0
+        self.resolution = 2  # index of the default DPI
+        self.is_open = False
+        self.writes = 0  # number of accepted profile writes, "flash wear"
+        self._input = deque(bytes(r) for r in input_reports)
+        self._input_ready = threading.Condition()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def device_info(self) -> dict:
+        # the dict hid.enumerate() would return for this device
+        return {
+            "path": self.path,
+            "vendor_id": VENDOR_ID,
+            "product_id": PRODUCT_ID,
+            "serial_number": self.serial_number,
+            "manufacturer_string": self.manufacturer,
+            "product_string": self.product,
+            "interface_number": 1,
+        }
+
+    def _delay(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _fails(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def open(self) -> None:
+        self._delay()
+        with self._lock:
+            if self.fail_open > 0:
+                self.fail_open -= 1
+                raise OSError("open failed (simulated)")
+            self.is_open = True
+
+    def close(self) -> None:
+        self.is_open = False
+
+    def _check_open(self) -> None:
+        if not self.is_open:
+            raise OSError("device is not open (simulated)")
+
+    def get_feature_report(self, report_id: int, length: int) -> list[int]:
+        self._delay()
+        with self._lock:
+            self._check_open()
+            if self._fails():
+                raise OSError("read error (simulated)")
+            if report_id == ACTIVE_PROFILE_REPORT_ID:
+                # profile in the high nibble, resolution index in bits 1-2
+                data = [report_id, (self.active_profile << 4) | (self.resolution << 1), 0, 0]
+            elif report_id in self.reports:
+                data = list(self.reports[report_id])
+            else:
+                raise OSError("unknown report id 0x%02X (simulated)" % report_id)
+            return data[:length]
+
+    def send_feature_report(self, data) -> int:
+        self._delay()
+        data = bytes(data)
+        with self._lock:
+            self._check_open()
+            if self._fails():
+                return -1
+            if data[0] == ACTIVE_PROFILE_REPORT_ID and len(data) == 4:
+                # [0xF0, 0x80 | (profile << 4), 0, 0]
+                self.active_profile = (data[1] >> 4) & 0x07
+                return len(data)
+            if data[0] in self.reports and len(data) == codec.REPORT_LENGTH:
+                self.reports[data[0]] = data
+                self.writes += 1
+                return len(data)
+            return -1
+
+    def feed_input_reports(self, reports: Iterable) -> None:
+        with self._input_ready:
+            self._input.extend(bytes(r) for r in reports)
+            self._input_ready.notify_all()
+
+    def read(self, length: int, timeout_ms: int = 0) -> list[int]:
+        self._delay()
+        self._check_open()
+        with self._input_ready:
+            if not self._input and timeout_ms:
+                self._input_ready.wait(None if timeout_ms < 0 else timeout_ms / 1000)
+            if not self._input:
+                return []
+            return list(self._input.popleft()[:length])
+
+
+class SimulatedBus:
+    # Several simulated G600s standing in for hid.enumerate() + open_path()
+    #
+    #   bus = SimulatedBus(count=8, latency=0.01)
+    #   apply_to_all_devices(profiles, devices=bus.enumerate(), open_transport=bus.open_transport)
+
+    def __init__(self, count: int = 1, seed: int | None = None, **kwargs):
+        self.devices = {}
+        for i in range(count):
+            device = SimulatedG600(
+                serial_number="SIM%04d" % i,
+                seed=None if seed is None else seed + i,
+                **kwargs,
+            )
+            self.devices[device.path] = device
+
+    def enumerate(self) -> list[dict]:
+        return [d.device_info() for d in self.devices.values()]
+
+    def open_transport(self, device_dict: dict) -> SimulatedG600:
+        return self.devices[device_dict["path"]]
@@ -0,0 +1,29 @@
+import pytest
+
+from logitech_g600.device import G600Session
+from logitech_g600.retry import NO_RETRY
+from logitech_g600.transport import SimulatedG600
+
+
+class FailingG600(SimulatedG600):
+    # a SimulatedG600 that refuses the next fail_writes[report id] writes of a report
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_writes = {}
+
+    def send_feature_report(self, data) -> int:
+        if self.fail_writes.get(data[0]):
+            self.fail_writes[data[0]] -= 1
+            return -1
+        return super().send_feature_report(data)
+
+
+@pytest.fixture
+def device():
+    return FailingG600()
+
+
+@pytest.fixture
+def session(device):
+    with G600Session(transport=device, verbose=False, retry=NO_RETRY) as session:
+        yield session
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+from logitech_g600.daemon import G600Daemon
+from logitech_g600.retry import NO_RETRY
+from logitech_g600.transport import SimulatedBus
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _started(tmp_path, bus, name="g600.sock"):
+    daemon = G600Daemon(
+        str(tmp_path / name), devices=bus.enumerate(), open_transport=bus.open_transport
+    )
+    await daemon.start()
+    return daemon
+
+
+async def _request(daemon, line: bytes) -> dict:
+    reader, writer = await asyncio.open_unix_connection(daemon.socket_path)
+    writer.write(line + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+def test_rollback_restores_the_real_active_profile(tmp_path, device):
+
+    async def main():
+        daemon = G600Daemon(
+            str(tmp_path / "g600.sock"),
+            devices=[device.device_info()],
+            open_transport=lambda device_dict: device,
+            retry=NO_RETRY,
+        )
+        await daemon.start()
+        device.active_profile = 2  # PROFILE_CYCLE_UP, the cache still says 0
+        device.fail_writes[0xF0] = 1
+        response = await daemon.dispatch({"op": "activate", "profile": 1})
+        daemon.close()
+        return response
+
+    response = _run(main())
+    assert not response["ok"] and response["rolled_back"]
+    assert device.active_profile == 2
+
+
+@pytest.mark.parametrize(
+    "line",
+    [b"[1]", b'{"op": "write", "reports": [1]}', b"not json", b'{"op": "read", "profile": 7}'],
+)
+def test_bad_requests_get_an_error_response(tmp_path, line):
+    bus = SimulatedBus(count=1)
+
+    async def main():
+        daemon = await _started(tmp_path, bus)
+        server = asyncio.ensure_future(daemon.serve_forever())
+        try:
+            return await _request(daemon, line)
+        finally:
+            server.cancel()
+            daemon.close()
+
+    response = _run(main())
+    assert response["ok"] is False
+    assert response["error"]
+
+
+def test_a_live_socket_is_not_taken_over(tmp_path):
+    bus = SimulatedBus(count=1)
+
+    async def main():
+        daemon = await _started(tmp_path, bus)
+        try:
+            with pytest.raises(OSError):
+                await _started(tmp_path, SimulatedBus(count=1))
+            return await _request(daemon, b'{"op": "devices"}')
+        finally:
+            daemon.close()
+
+    assert len(_run(main())["devices"]) == 1
+
+
+def test_a_stale_socket_is_replaced(tmp_path):
+    import socket
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "g600.sock"))
+    stale.close()  # the file stays, nobody listens
+
+    async def main():
+        daemon = await _started(tmp_path, SimulatedBus(count=1))
+        daemon.close()
+
+    _run(main())
+
+
+def test_a_device_that_fails_to_open_is_skipped(tmp_path):
+    bus = SimulatedBus(count=2)
+    list(bus.devices.values())[0].fail_open = 100
+
+    async def main():
+        daemon = await _started(tmp_path, bus)
+        devices = list(daemon.devices)
+        daemon.close()
+        return devices
+
+    assert _run(main()) == ["SIM0001"]
@@ -0,0 +1,42 @@
+from logitech_g600.fleet import apply_to_all_devices
+from logitech_g600.profile import LogitechG600Profile
+from logitech_g600.retry import NO_RETRY
+from logitech_g600.transport import SimulatedBus
+
+
+def _profiles() -> list[LogitechG600Profile]:
+    profile = LogitechG600Profile(1)
+    profile.color = (0, 255, 0)
+    return [LogitechG600Profile(0), profile]
+
+
+def test_apply_to_all_devices():
+    bus = SimulatedBus(count=4)
+    results = apply_to_all_devices(
+        _profiles(), activate=1, devices=bus.enumerate(), open_transport=bus.open_transport
+    )
+    assert [r.ok for r in results] == [True] * 4
+    assert all(r.written == [1] and r.unchanged == [0] and r.activated == 1 for r in results)
+    for device in bus.devices.values():
+        assert device.reports[0xF4][1:4] == bytes([0, 255, 0])
+        assert device.active_profile == 1
+
+    # a second run finds everything on the devices already
+    results = apply_to_all_devices(
+        _profiles(), devices=bus.enumerate(), open_transport=bus.open_transport
+    )
+    assert all(r.written == [] for r in results)
+
+
+def test_a_failing_device_does_not_stop_the_others():
+    bus = SimulatedBus(count=3)
+    broken = list(bus.devices.values())[1]
+    broken.fail_open = 100
+    results = apply_to_all_devices(
+        _profiles(),
+        devices=bus.enumerate(),
+        open_transport=bus.open_transport,
+        retry=NO_RETRY,
+    )
+    assert [r.ok for r in results] == [True, False, True]
+    assert broken.writes == 0
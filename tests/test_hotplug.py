@@ -0,0 +1,45 @@
+import socket
+
+from logitech_g600.hotplug import DeviceWatcher
+from logitech_g600.transport import SimulatedBus
+
+
+def _watcher(bus, **kwargs) -> DeviceWatcher:
+    return DeviceWatcher(use_uevents=False, enumerate=bus.enumerate, **kwargs)
+
+
+def test_scan_reports_added_and_removed_devices():
+    bus = SimulatedBus(count=2)
+    watcher = _watcher(bus)
+    assert [(e.action, e.key) for e in watcher.scan()] == [("add", "SIM0000"), ("add", "SIM0001")]
+    del bus.devices[b"sim:SIM0000"]
+    assert [(e.action, e.key) for e in watcher.scan()] == [("remove", "SIM0000")]
+    assert watcher.scan() == []
+
+
+def test_rescan_interval_with_uevents():
+    bus = SimulatedBus(count=1)
+    watcher = _watcher(bus, poll_interval=2.0, rescan_interval=60.0)
+    timeouts = []
+
+    def wait(timeout):
+        timeouts.append(timeout)
+        watcher.stop()
+        return False
+
+    watcher._wait = wait
+    watcher.uevents, other = socket.socketpair()
+    try:
+        list(watcher.events())
+    finally:
+        watcher.close()
+        other.close()
+    assert timeouts == [60.0]
+
+
+def test_poll_interval_without_uevents():
+    watcher = _watcher(SimulatedBus(count=1), poll_interval=2.0)
+    timeouts = []
+    watcher._wait = lambda timeout: timeouts.append(timeout) or watcher.stop()
+    list(watcher.events())
+    assert timeouts == [2.0]
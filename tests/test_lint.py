@@ -0,0 +1,41 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from logitech_g600.lint import lint_file, lint_paths, lint_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _dumped_profiles() -> list[list[int]]:
+    # the reports read from a real G600, in read_logitech_g600_profiles.py
+    source = (ROOT / "read_logitech_g600_profiles.py").read_text()
+    return [
+        [int(v) for v in re.search(r"^profile%d = \[(.*)\]" % n, source, re.M).group(1).split(",")]
+        for n in range(3)
+    ]
+
+
+@pytest.mark.parametrize("report", _dumped_profiles())
+def test_device_dumps_have_no_errors(report):
+    assert [m for s, m in lint_report(report) if s == "error"] == []
+
+
+def test_out_of_range_dpi_is_an_error():
+    report = _dumped_profiles()[2]
+    report[14] = 2  # 100 dpi
+    assert ("error", "DPI1 100 out of 200-8200") in lint_report(report)
+
+
+def test_bundled_profiles_are_clean():
+    assert all(problems == [] for problems in lint_paths([ROOT / "profiles"], jobs=1).values())
+
+
+@pytest.mark.parametrize("line", ['"abc"', '{"a": 1}', "[1, 256]", "[1, "])
+def test_invalid_dump_lines_are_findings(tmp_path, line):
+    path = tmp_path / "dump.txt"
+    path.write_text("[%s]\n%s\n" % (", ".join(["0"] * 154), line))
+    problems = lint_file(str(path))
+    assert problems[-1].severity == "error"
+    assert "line 2" in problems[-1].message
@@ -0,0 +1,39 @@
+from logitech_g600 import codec
+from logitech_g600.profile_file import ProfileBuilder
+
+LEAF = 'base = "team.toml"\nprofile = 0\n'
+
+
+def _team(tmp_path, name: str, color: list[int]):
+    directory = tmp_path / name
+    directory.mkdir()
+    (directory / "team.toml").write_text("profile = 0\ncolor = %s\n" % color)
+    (directory / "leaf.toml").write_text(LEAF)
+    return directory / "leaf.toml"
+
+
+def test_same_leaf_text_with_different_bases(tmp_path):
+    red = _team(tmp_path, "teamA", [255, 0, 0])
+    blue = _team(tmp_path, "teamB", [0, 0, 255])
+    cache_dir = tmp_path / "cache"
+    ProfileBuilder(cache_dir).compile(red)
+    builder = ProfileBuilder(cache_dir)
+    assert codec.decode_report(builder.compile(blue)).led_color == (0, 0, 255)
+    assert builder.cached == 0
+
+
+def test_cache_hit(tmp_path):
+    leaf = _team(tmp_path, "team", [255, 0, 0])
+    cache_dir = tmp_path / "cache"
+    report = ProfileBuilder(cache_dir).compile(leaf)
+    builder = ProfileBuilder(cache_dir)
+    assert builder.compile(leaf) == report
+    assert builder.cached == 1
+
+
+def test_base_change_recompiles(tmp_path):
+    leaf = _team(tmp_path, "team", [255, 0, 0])
+    cache_dir = tmp_path / "cache"
+    ProfileBuilder(cache_dir).compile(leaf)
+    (leaf.parent / "team.toml").write_text("profile = 0\ncolor = [0, 255, 0]\n")
+    assert codec.decode_report(ProfileBuilder(cache_dir).compile(leaf)).led_color == (0, 255, 0)
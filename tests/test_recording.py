@@ -0,0 +1,46 @@
+import pytest
+
+from logitech_g600.device import G600Session
+from logitech_g600.recording import InputLog, InputRecorder, ReplayTransport
+
+
+def _record(path, timestamps_ns):
+    with InputRecorder(str(path)) as recorder:
+        for i, timestamp_ns in enumerate(timestamps_ns):
+            recorder.write([0, i, 0, 0, 0, 0, 0, 0], timestamp_ns)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "rec.log"
+    _record(path, [0, 1_000, 2_000])
+    with InputLog(str(path)) as log:
+        assert len(log) == 3
+        assert log.duration_ns() == 2_000
+        assert [bytes(data)[1] for _, data in log] == [0, 1, 2]
+
+
+def test_replay_stopped_before_a_pending_record(tmp_path):
+    path = tmp_path / "rec.log"
+    _record(path, [0, 500_000_000])
+    with InputLog(str(path)) as log:
+        with G600Session(transport=ReplayTransport(log), verbose=False) as session:
+            assert session.read_input_report(8, 10)
+            assert session.read_input_report(8, 10) == []  # not due yet
+
+
+def test_replay_eof(tmp_path):
+    path = tmp_path / "rec.log"
+    _record(path, [0])
+    with InputLog(str(path)) as log:
+        transport = ReplayTransport(log, speed=0)
+        assert transport.read(8) == [0] * 8
+        with pytest.raises(EOFError):
+            transport.read(8)
+        transport.close()
+
+
+def test_recorder_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-recording"
+    path.write_bytes(b"x" * 20)
+    with pytest.raises(ValueError):
+        InputRecorder(str(path))
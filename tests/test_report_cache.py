@@ -0,0 +1,37 @@
+import json
+import threading
+
+from logitech_g600.report_cache import WrittenReportCache
+
+REPORT = bytes([0xF3]) + bytes(153)
+
+
+def test_remember(tmp_path):
+    path = tmp_path / "written_reports.json"
+    WrittenReportCache(path).remember("SIM0000", REPORT)
+    cache = WrittenReportCache(path)
+    assert cache.is_current("SIM0000", REPORT)
+    assert not cache.is_current("SIM0001", REPORT)
+    assert not cache.is_current(None, REPORT)
+
+
+def test_concurrent_writers(tmp_path):
+    path = tmp_path / "written_reports.json"
+    errors = []
+
+    def writer(n):
+        try:
+            for _ in range(50):
+                WrittenReportCache(path).remember("SIM%04d" % n, REPORT)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    # last writer wins, but the file is always a whole JSON document
+    assert isinstance(json.loads(path.read_text()), dict)
+    assert [p.name for p in tmp_path.iterdir()] == ["written_reports.json"]
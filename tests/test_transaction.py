@@ -0,0 +1,66 @@
+import pytest
+
+from logitech_g600.errors import ApplyError
+from logitech_g600.transaction import apply_profiles
+from logitech_g600.transport import PROFILE_REPORT_IDS
+
+
+def _changed(device, profile_number: int) -> bytes:
+    report = bytearray(device.reports[PROFILE_REPORT_IDS[profile_number]])
+    report[1] ^= 0xFF
+    return bytes(report)
+
+
+def test_apply_writes_only_changed_reports(device, session):
+    report = _changed(device, 1)
+    result = apply_profiles(session, {0: bytes(device.reports[0xF3]), 1: report}, activate=1)
+    assert result.written == [1]
+    assert result.unchanged == [0]
+    assert bytes(device.reports[0xF4]) == report
+    assert device.active_profile == 1
+
+
+def test_failed_write_rolls_back(device, session):
+    before = {k: bytes(v) for k, v in device.reports.items()}
+    device.fail_writes[0xF4] = 1
+    with pytest.raises(ApplyError) as e:
+        apply_profiles(session, {0: _changed(device, 0), 1: _changed(device, 1)})
+    assert e.value.result.rolled_back
+    assert {k: bytes(v) for k, v in device.reports.items()} == before
+
+
+def test_failed_activate_rolls_back(device, session):
+    before = bytes(device.reports[0xF3])
+    device.fail_writes[0xF0] = 1
+    with pytest.raises(ApplyError):
+        apply_profiles(session, {0: _changed(device, 0)}, activate=2)
+    assert bytes(device.reports[0xF3]) == before
+    assert device.active_profile == 0
+
+
+@pytest.mark.parametrize(
+    "reports",
+    [
+        {0: "wrong report id"},
+        {0: "short"},
+        {3: "no such profile"},
+    ],
+)
+def test_invalid_reports_are_rejected_before_writing(device, session, reports):
+    report = {
+        "wrong report id": bytes(device.reports[0xF4]),
+        "short": bytes(device.reports[0xF3])[:100],
+        "no such profile": bytes(device.reports[0xF3]),
+    }
+    writes = device.writes
+    with pytest.raises(ValueError):
+        apply_profiles(session, {n: report[r] for n, r in reports.items()})
+    assert device.writes == writes
+
+
+def test_snapshot_missing_a_written_profile(device, session):
+    writes = device.writes
+    snapshot = {1: bytes(device.reports[0xF4])}
+    with pytest.raises(ValueError):
+        apply_profiles(session, {0: _changed(device, 0)}, snapshot=snapshot, previous_active=0)
+    assert device.writes == writes
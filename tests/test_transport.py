@@ -0,0 +1,61 @@
+import sys
+import types
+
+import pytest
+
+from logitech_g600.device import G600Session
+from logitech_g600.transport import HidapiTransport, SimulatedG600
+
+
+class FakeHidDevice:
+    # stands in for hid.device, fails reading the descriptor strings
+    instances = []
+
+    def __init__(self):
+        self.closed = False
+        FakeHidDevice.instances.append(self)
+
+    def open(self, vendor_id, product_id):
+        pass
+
+    def get_manufacturer_string(self):
+        raise OSError("device disconnected")
+
+    def close(self):
+        self.closed = True
+
+
+def test_hidapi_open_closes_the_handle_on_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "hid", types.SimpleNamespace(device=FakeHidDevice))
+    FakeHidDevice.instances = []
+    with pytest.raises(OSError):
+        HidapiTransport().open()
+    assert [d.closed for d in FakeHidDevice.instances] == [True]
+
+
+def test_simulated_device_round_trip():
+    device = SimulatedG600()
+    with G600Session(transport=device, verbose=False) as session:
+        report = bytearray(session.read_profile_report(2))
+        report[1] = 0x12
+        session.write_profile_report(report)
+        assert bytes(session.read_profile_report(2)) == bytes(report)
+        session.set_active_profile(2)
+        assert session.read_active_state().profile == 2
+    assert device.writes == 1
+    assert not device.is_open
+
+
+def test_simulated_input_reports():
+    device = SimulatedG600(input_reports=[[0, 1, 0, 0, 0, 0, 0, 0]])
+    with G600Session(transport=device, verbose=False) as session:
+        assert session.read_input_report(8, 0) == [0, 1, 0, 0, 0, 0, 0, 0]
+        assert session.read_input_report(8, 0) == []
+        assert session.read_input_report(8, 5) == []
+
+
+def test_session_closes_the_device_when_open_fails():
+    device = SimulatedG600(fail_open=100)
+    with pytest.raises(OSError):
+        G600Session(transport=device, verbose=False).open()
+    assert not device.is_open